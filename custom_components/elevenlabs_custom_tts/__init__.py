@@ -4,66 +4,113 @@ from __future__ import annotations
 
 import logging
 
-from elevenlabs import AsyncElevenLabs
-from elevenlabs.core import ApiError
+import httpx
+import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_API_KEY
 from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.httpx_client import get_async_client
+from homeassistant.helpers.typing import ConfigType
 
 from .const import (
     DOMAIN,
     SERVICE_GET_VOICES,
     ATTR_VOICE_TYPE,
     ATTR_SEARCH_TEXT,
+    ELEVENLABS_API_URL,
+    VOICES_REQUEST_TIMEOUT,
+    DRAIN_TIMEOUT,
+    SERVICE_BENCHMARK_PROFILES,
+    ATTR_PROFILES,
+    ATTR_MODELS,
+    ATTR_SENTENCES,
+    ATTR_REPETITIONS,
+    ATTR_CONCURRENCY,
+    ATTR_CONFIG_ENTRY_ID,
+    BENCHMARK_SENTENCES,
+    DEFAULT_BENCHMARK_REPETITIONS,
+    DEFAULT_BENCHMARK_CONCURRENCY,
+    MAX_BENCHMARK_REPETITIONS,
+    MAX_BENCHMARK_CONCURRENCY,
+    MODEL_IDS,
 )
+from .benchmark import async_run_benchmark, async_save_run
+from .lifecycle import async_get_client_registry
+from .models import ElevenLabsRuntimeData
+from .voices import parse_voices
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+BENCHMARK_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    vol.Optional(ATTR_PROFILES): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_MODELS): vol.All(cv.ensure_list, [vol.In(MODEL_IDS)]),
+    vol.Optional(ATTR_SENTENCES): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_REPETITIONS, default=DEFAULT_BENCHMARK_REPETITIONS): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=MAX_BENCHMARK_REPETITIONS)
+    ),
+    vol.Optional(ATTR_CONCURRENCY, default=DEFAULT_BENCHMARK_CONCURRENCY): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=MAX_BENCHMARK_CONCURRENCY)
+    ),
+})
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the ElevenLabs Custom TTS domain."""
+    # Services are registered once per domain and look up entries at call time
+    await _async_register_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up ElevenLabs Custom TTS from a config entry."""
     
-    # Store the client in hass.data
-    httpx_client = get_async_client(hass)
-    client = AsyncElevenLabs(
-        api_key=entry.data[CONF_API_KEY], 
-        httpx_client=httpx_client
-    )
+    # Store the shared client in hass.data
+    client = async_get_client_registry(hass).acquire(entry.data[CONF_API_KEY])
     
     # Skip connection test during setup since it's already validated in config flow
     # The blocking import_module warning was occurring here due to pydantic imports
     # during the voices.get_all() call in the async event loop
     
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = client
+    hass.data[DOMAIN][entry.entry_id] = ElevenLabsRuntimeData(
+        client=client, api_key=entry.data[CONF_API_KEY]
+    )
     
     # Set up TTS platform
     await hass.config_entries.async_forward_entry_setups(entry, ["tts"])
     
-    # Register services
-    await _async_register_services(hass, client)
-    
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    runtime_data = hass.data[DOMAIN][entry.entry_id]
+    
+    # Let in-flight announcements finish before tearing the entry down
+    if not await runtime_data.requests.async_drain(DRAIN_TIMEOUT):
+        _LOGGER.warning(
+            "Unloading with %d TTS requests still in flight after %d seconds",
+            runtime_data.requests.in_flight,
+            DRAIN_TIMEOUT,
+        )
+    
     # Unload TTS platform
     unload_ok = await hass.config_entries.async_unload_platforms(entry, ["tts"])
     
-    hass.data[DOMAIN].pop(entry.entry_id, None)
-    
-    # Unregister services if this is the last entry
-    if not hass.data[DOMAIN]:
-        hass.services.async_remove(DOMAIN, SERVICE_GET_VOICES)
+    if unload_ok:
+        hass.data[DOMAIN].pop(entry.entry_id, None)
+        async_get_client_registry(hass).release(entry.data[CONF_API_KEY])
     
     return unload_ok
 
 
-async def _async_register_services(hass: HomeAssistant, client: AsyncElevenLabs) -> None:
+async def _async_register_services(hass: HomeAssistant) -> None:
     """Register the services."""
     
     async def get_voices_service(call: ServiceCall) -> ServiceResponse:
@@ -71,50 +118,70 @@ async def _async_register_services(hass: HomeAssistant, client: AsyncElevenLabs)
         voice_type = call.data.get(ATTR_VOICE_TYPE)
         search_text = call.data.get(ATTR_SEARCH_TEXT, "").lower().strip()
         
-        # Get the first available client from hass.data
-        entry_clients = list(hass.data[DOMAIN].values())
-        if not entry_clients:
+        # Get the first available entry from hass.data
+        entry_data = list(hass.data.get(DOMAIN, {}).values())
+        if not entry_data:
             raise HomeAssistantError("No ElevenLabs client available")
-        client = entry_clients[0]
+        api_key = entry_data[0].api_key
         
         try:
-            # Use the async client directly but handle the blocking import properly
-            voices_response = await client.voices.get_all()
-            voices_list = []
-            
-            for voice in voices_response.voices:
-                voice_data = {
-                    "voice_id": voice.voice_id,
-                    "name": voice.name,
-                    "category": voice.category,
-                }
-                if hasattr(voice, 'description') and voice.description:
-                    voice_data["description"] = voice.description
-                if hasattr(voice, 'labels') and voice.labels:
-                    voice_data["labels"] = voice.labels
-                
-                # Apply voice type filter
-                if voice_type and voice.category != voice_type:
-                    continue
-                
-                # Apply search text filter
-                if search_text:
-                    searchable_text = f"{voice.name.lower()} {voice.category.lower()}"
-                    if hasattr(voice, 'description') and voice.description:
-                        searchable_text += f" {voice.description.lower()}"
-                    if hasattr(voice, 'labels') and voice.labels:
-                        searchable_text += f" {' '.join(voice.labels).lower()}"
-                    
-                    if search_text not in searchable_text:
-                        continue
-                
-                voices_list.append(voice_data)
-                
-            return {"voices": voices_list}
-            
-        except ApiError as exc:
+            # Read the raw JSON instead of going through the SDK, which builds
+            # a full pydantic model per voice on the event loop
+            response = await get_async_client(hass).get(
+                f"{ELEVENLABS_API_URL}/v1/voices",
+                headers={"xi-api-key": api_key},
+                timeout=VOICES_REQUEST_TIMEOUT,
+            )
+        except httpx.HTTPError as exc:
             _LOGGER.error("Error fetching voices: %s", exc)
             raise HomeAssistantError(f"Failed to fetch voices: {exc}") from exc
+        
+        if response.status_code != 200:
+            _LOGGER.error("Error fetching voices: %s %s", response.status_code, response.text)
+            raise HomeAssistantError(
+                f"Failed to fetch voices: status {response.status_code}"
+            )
+        
+        voices_list = await hass.async_add_executor_job(
+            parse_voices, response.content, voice_type, search_text
+        )
+        return {"voices": voices_list}
+
+    async def benchmark_profiles_service(call: ServiceCall) -> ServiceResponse:
+        """Service to measure the latency of voice profiles."""
+        entries = [
+            entry
+            for entry in hass.config_entries.async_entries(DOMAIN)
+            if entry.entry_id in hass.data.get(DOMAIN, {})
+        ]
+        if not entries:
+            raise HomeAssistantError("No ElevenLabs client available")
+        if entry_id := call.data.get(ATTR_CONFIG_ENTRY_ID):
+            entries = [entry for entry in entries if entry.entry_id == entry_id]
+            if not entries:
+                raise HomeAssistantError(f"Config entry {entry_id} is not loaded")
+        elif len(entries) > 1:
+            raise HomeAssistantError(
+                "Several ElevenLabs entries are loaded, choose one with config_entry_id"
+            )
+        entry = entries[0]
+        
+        voice_profiles = entry.options.get("voice_profiles", {})
+        profile_names = call.data.get(ATTR_PROFILES) or list(voice_profiles)
+        if not profile_names:
+            raise HomeAssistantError("No voice profiles configured to benchmark")
+        if unknown := [name for name in profile_names if name not in voice_profiles]:
+            raise HomeAssistantError(f"Unknown voice profiles: {', '.join(unknown)}")
+        
+        results = await async_run_benchmark(
+            hass.data[DOMAIN][entry.entry_id].client,
+            {name: voice_profiles[name] for name in profile_names},
+            call.data.get(ATTR_MODELS),
+            call.data.get(ATTR_SENTENCES) or BENCHMARK_SENTENCES,
+            call.data[ATTR_REPETITIONS],
+            call.data[ATTR_CONCURRENCY],
+        )
+        return await async_save_run(hass, results)
 
     # Register the services
     hass.services.async_register(
@@ -122,4 +189,11 @@ async def _async_register_services(hass: HomeAssistant, client: AsyncElevenLabs)
         SERVICE_GET_VOICES,
         get_voices_service,
         supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BENCHMARK_PROFILES,
+        benchmark_profiles_service,
+        schema=BENCHMARK_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
     )
\ No newline at end of file
@@ -0,0 +1,288 @@
+"""Post-processing of synthesized audio.
+
+Everything in this module is blocking and must run in an executor.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+import io
+import logging
+import struct
+import subprocess
+import sys
+import time
+from typing import Any
+import wave
+
+from .const import (
+    DEFAULT_TARGET_LUFS,
+    DEFAULT_POST_SAMPLE_RATE,
+    LOUDNORM_MAX_LUFS,
+    LOUDNORM_MIN_LUFS,
+    SILENCE_THRESHOLD_DBFS,
+    SILENCE_PADDING_MS,
+)
+from .mp3 import join_mp3, scan_mp3
+
+_LOGGER = logging.getLogger(__name__)
+
+FFMPEG_TIMEOUT = 30
+JOIN_SAMPLE_RATE = 24000
+
+
+@dataclass(frozen=True)
+class PostProcessSettings:
+    """Post-processing settings of a voice profile."""
+
+    trim_silence: bool = False
+    target_lufs: float = DEFAULT_TARGET_LUFS
+    sample_rate: int = DEFAULT_POST_SAMPLE_RATE
+    downmix: bool = False
+
+    @classmethod
+    def from_options(cls, options: dict[str, Any]) -> PostProcessSettings:
+        """Build the settings from merged TTS options."""
+        return cls(
+            trim_silence=bool(options.get("trim_silence", False)),
+            target_lufs=float(options.get("target_lufs", DEFAULT_TARGET_LUFS)),
+            sample_rate=int(options.get("sample_rate", DEFAULT_POST_SAMPLE_RATE)),
+            downmix=bool(options.get("downmix", False)),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if any processing step is enabled."""
+        return bool(self.trim_silence or self.target_lufs or self.sample_rate or self.downmix)
+
+
+def pcm_to_wav(pcm: bytes, sample_rate: int, channels: int = 1) -> bytes:
+    """Wrap signed 16-bit little-endian PCM in a WAV container."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def _parse_wav(data: bytes) -> tuple[array, int, int]:
+    """Return the 16-bit samples, sample rate and channel count of a WAV file.
+
+    Chunk sizes are not trusted for the data chunk, since ffmpeg writes
+    placeholder sizes when its output is a pipe.
+    """
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        raise ValueError("Not a WAV file")
+    offset = 12
+    sample_rate = channels = 0
+    while offset + 8 <= len(data):
+        chunk_id = data[offset:offset + 4]
+        chunk_size = struct.unpack_from("<I", data, offset + 4)[0]
+        body = offset + 8
+        if chunk_id == b"fmt ":
+            audio_format, channels, sample_rate = struct.unpack_from("<HHI", data, body)
+            bits = struct.unpack_from("<H", data, body + 14)[0]
+            if audio_format not in (1, 0xFFFE) or bits != 16:
+                raise ValueError("Only 16-bit PCM WAV audio is supported")
+        elif chunk_id == b"data":
+            if not channels:
+                raise ValueError("WAV data chunk before format chunk")
+            end = len(data) if chunk_size in (0, 0xFFFFFFFF) else min(len(data), body + chunk_size)
+            pcm = data[body:end]
+            samples = array("h")
+            samples.frombytes(pcm[: len(pcm) - len(pcm) % 2])
+            if sys.byteorder == "big":
+                samples.byteswap()
+            return samples, sample_rate, channels
+        offset = body + chunk_size + (chunk_size & 1)
+    raise ValueError("WAV file has no data chunk")
+
+
+def _to_wav(samples: array, sample_rate: int, channels: int) -> bytes:
+    """Encode 16-bit samples as WAV."""
+    if sys.byteorder == "big":
+        samples = array("h", samples)
+        samples.byteswap()
+    return pcm_to_wav(samples.tobytes(), sample_rate, channels)
+
+
+def _run_ffmpeg(ffmpeg_binary: str, args: list[str], data: bytes) -> bytes:
+    """Pipe data through ffmpeg and return its output."""
+    result = subprocess.run(
+        [ffmpeg_binary, "-hide_banner", "-loglevel", "error", *args],
+        input=data,
+        capture_output=True,
+        check=False,
+        timeout=FFMPEG_TIMEOUT,
+    )
+    if result.returncode != 0 or not result.stdout:
+        raise RuntimeError(f"ffmpeg failed: {result.stderr.decode(errors='replace').strip()}")
+    return result.stdout
+
+
+def _wav_pcm(data: bytes) -> tuple[bytes, int, int]:
+    """Return the little-endian PCM, sample rate and channel count of a WAV file."""
+    samples, sample_rate, channels = _parse_wav(data)
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return samples.tobytes(), sample_rate, channels
+
+
+def _filter_pcm(
+    ffmpeg_binary: str,
+    pcm: bytes,
+    sample_rate: int,
+    channels: int,
+    args: list[str],
+) -> bytes:
+    """Run raw 16-bit PCM through one ffmpeg pass, keeping it raw PCM."""
+    return _run_ffmpeg(
+        ffmpeg_binary,
+        [
+            "-f", "s16le", "-ar", str(sample_rate), "-ac", str(channels), "-i", "pipe:0",
+            *args,
+            "-f", "s16le", "-acodec", "pcm_s16le", "pipe:1",
+        ],
+        pcm,
+    )
+
+
+def _trim_filter() -> str:
+    """Return the ffmpeg filter removing leading and trailing silence."""
+    # Trim the start, then the end by trimming the reversed clip
+    trim = (
+        "silenceremove=start_periods=1"
+        f":start_threshold={SILENCE_THRESHOLD_DBFS}dB"
+        f":start_silence={SILENCE_PADDING_MS / 1000}"
+    )
+    return f"{trim},areverse,{trim},areverse"
+
+
+def post_process_audio(
+    extension: str,
+    data: bytes,
+    settings: PostProcessSettings,
+    ffmpeg_binary: str,
+) -> tuple[str, bytes, float, dict[str, float]]:
+    """Trim, normalize, resample and downmix a clip.
+
+    The clip is processed as raw PCM, one ffmpeg pass per enabled step. WAV
+    audio is PCM already and is neither decoded nor encoded by ffmpeg.
+
+    Returns the extension, the processed audio, its duration in seconds and
+    the time spent in each step in milliseconds.
+    """
+    if extension not in ("mp3", "wav"):
+        raise ValueError(f"Unsupported audio format for post-processing: {extension}")
+    timings: dict[str, float] = {}
+    start = time.perf_counter()
+
+    def _timed(step: str) -> None:
+        nonlocal start
+        now = time.perf_counter()
+        timings[step] = round((now - start) * 1000, 2)
+        start = now
+
+    if extension == "wav":
+        pcm, sample_rate, channels = _wav_pcm(data)
+    else:
+        info = scan_mp3(data).info
+        if not info.sample_rate:
+            raise ValueError("No MP3 frames found")
+        sample_rate, channels = info.sample_rate, info.channels
+        pcm = _run_ffmpeg(
+            ffmpeg_binary,
+            ["-f", "mp3", "-i", "pipe:0", "-f", "s16le", "-acodec", "pcm_s16le", "pipe:1"],
+            data,
+        )
+    _timed("decode")
+
+    if settings.trim_silence:
+        pcm = _filter_pcm(ffmpeg_binary, pcm, sample_rate, channels, ["-af", _trim_filter()])
+        _timed("trim_silence")
+    if settings.target_lufs:
+        target = max(LOUDNORM_MIN_LUFS, min(LOUDNORM_MAX_LUFS, settings.target_lufs))
+        # loudnorm works at 192 kHz, so the output rate is always explicit
+        pcm = _filter_pcm(
+            ffmpeg_binary,
+            pcm,
+            sample_rate,
+            channels,
+            ["-af", f"loudnorm=I={target}", "-ar", str(sample_rate)],
+        )
+        _timed("normalize")
+    if settings.sample_rate and settings.sample_rate != sample_rate:
+        pcm = _filter_pcm(
+            ffmpeg_binary, pcm, sample_rate, channels, ["-ar", str(settings.sample_rate)]
+        )
+        sample_rate = settings.sample_rate
+        _timed("resample")
+    if settings.downmix and channels > 1:
+        pcm = _filter_pcm(ffmpeg_binary, pcm, sample_rate, channels, ["-ac", "1"])
+        channels = 1
+        _timed("downmix")
+
+    duration = len(pcm) / (2 * channels * sample_rate)
+    if extension == "wav":
+        output = pcm_to_wav(pcm, sample_rate, channels)
+    else:
+        output = _run_ffmpeg(
+            ffmpeg_binary,
+            [
+                "-f", "s16le", "-ar", str(sample_rate), "-ac", str(channels), "-i", "pipe:0",
+                "-f", "mp3", "-b:a", "128k", "pipe:1",
+            ],
+            pcm,
+        )
+    _timed("encode")
+    return extension, output, duration, timings
+
+
+def join_clips(clips: list[tuple[str, bytes]], ffmpeg_binary: str) -> tuple[str, bytes]:
+    """Join clips in order into a single clip.
+
+    Clips that share a format are concatenated directly (MP3 frame by frame);
+    mixed formats are decoded to a common PCM format and encoded as the first
+    clip's format.
+    """
+    extensions = {extension for extension, _ in clips}
+    if extensions == {"mp3"} and (joined := join_mp3([data for _, data in clips])):
+        return "mp3", joined
+
+    if extensions == {"wav"}:
+        parsed = [_parse_wav(data) for _, data in clips]
+        if len({(rate, channels) for _, rate, channels in parsed}) == 1:
+            samples = array("h")
+            for clip_samples, _, _ in parsed:
+                samples.extend(clip_samples)
+            return "wav", _to_wav(samples, parsed[0][1], parsed[0][2])
+
+    pcm = b"".join(
+        _run_ffmpeg(
+            ffmpeg_binary,
+            ["-i", "pipe:0", "-f", "s16le", "-ar", str(JOIN_SAMPLE_RATE), "-ac", "1", "pipe:1"],
+            data,
+        )
+        for _, data in clips
+    )
+    output = pcm_to_wav(pcm, JOIN_SAMPLE_RATE)
+    if clips[0][0] == "wav":
+        return "wav", output
+    return "mp3", _run_ffmpeg(
+        ffmpeg_binary,
+        ["-f", "wav", "-i", "pipe:0", "-f", "mp3", "-b:a", "128k", "pipe:1"],
+        output,
+    )
+
+
+def audio_duration(extension: str | None, data: bytes) -> float | None:
+    """Return the playing time of a clip in seconds, if the format is known."""
+    if extension == "mp3":
+        return scan_mp3(data).info.duration
+    if extension == "wav":
+        samples, sample_rate, channels = _parse_wav(data)
+        return len(samples) / channels / sample_rate
+    return None
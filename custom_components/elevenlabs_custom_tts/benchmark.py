@@ -0,0 +1,181 @@
+"""Latency benchmarking of voice profiles."""
+
+from __future__ import annotations
+
+import asyncio
+from itertools import product
+import logging
+from statistics import median
+import time
+from typing import Any
+
+from elevenlabs import AsyncElevenLabs, VoiceSettings
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    AUDIO_FORMAT_WAV,
+    BENCHMARK_HISTORY_SIZE,
+    BENCHMARK_STORAGE_KEY,
+    BENCHMARK_STORAGE_VERSION,
+    DATA_BENCHMARK_LOCK,
+    DATA_BENCHMARK_STORE,
+    DEFAULT_APPLY_TEXT_NORMALIZATION,
+    DEFAULT_AUDIO_FORMAT,
+    DEFAULT_MODEL,
+    DEFAULT_SIMILARITY_BOOST,
+    DEFAULT_SPEED,
+    DEFAULT_STABILITY,
+    DEFAULT_STYLE,
+    DEFAULT_USE_SPEAKER_BOOST,
+    NO_FORCED_NORMALIZATION_MODELS,
+    PCM_OUTPUT_FORMAT,
+)
+from .hedging import async_close_stream
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def _async_measure(
+    client: AsyncElevenLabs, profile: dict[str, Any], model_id: str, text: str
+) -> tuple[float, float, int]:
+    """Synthesize text once and return TTFB, total time and audio bytes."""
+    apply_text_normalization = profile.get(
+        "apply_text_normalization", DEFAULT_APPLY_TEXT_NORMALIZATION
+    )
+    if model_id in NO_FORCED_NORMALIZATION_MODELS and apply_text_normalization == "on":
+        apply_text_normalization = "auto"
+
+    convert_params: dict[str, Any] = {
+        "text": text,
+        "voice_id": profile["voice"],
+        "model_id": model_id,
+        "voice_settings": VoiceSettings(
+            stability=profile.get("stability", DEFAULT_STABILITY),
+            similarity_boost=profile.get("similarity_boost", DEFAULT_SIMILARITY_BOOST),
+            style=profile.get("style", DEFAULT_STYLE),
+            use_speaker_boost=profile.get("use_speaker_boost", DEFAULT_USE_SPEAKER_BOOST),
+            speed=profile.get("speed", DEFAULT_SPEED),
+        ),
+        "apply_text_normalization": apply_text_normalization,
+    }
+    # Measure the same output the profile is synthesized with
+    if profile.get("audio_format", DEFAULT_AUDIO_FORMAT) == AUDIO_FORMAT_WAV:
+        convert_params["output_format"] = PCM_OUTPUT_FORMAT
+
+    start = time.monotonic()
+    ttfb = None
+    audio_bytes = 0
+    audio_generator = client.text_to_speech.convert(**convert_params)
+    try:
+        async for chunk in audio_generator:
+            if ttfb is None and chunk:
+                ttfb = time.monotonic() - start
+            audio_bytes += len(chunk)
+    finally:
+        await async_close_stream(audio_generator)
+    total = time.monotonic() - start
+    return (ttfb if ttfb is not None else total), total, audio_bytes
+
+
+async def async_run_benchmark(
+    client: AsyncElevenLabs,
+    profiles: dict[str, dict[str, Any]],
+    models: list[str] | None,
+    sentences: list[str],
+    repetitions: int,
+    concurrency: int,
+) -> list[dict[str, Any]]:
+    """Benchmark each profile, or each profile with each model.
+
+    Returns one result per combination with median TTFB and total time, and
+    audio bytes and characters produced per second of synthesis time.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    combinations = [
+        (profile_name, model_id)
+        for profile_name, profile in profiles.items()
+        for model_id in (models or [profile.get("model_id", DEFAULT_MODEL)])
+    ]
+
+    async def _async_run(
+        profile_name: str, model_id: str, text: str
+    ) -> tuple[str, str, int, tuple[float, float, int] | None]:
+        async with semaphore:
+            try:
+                measurement = await _async_measure(
+                    client, profiles[profile_name], model_id, text
+                )
+            except Exception as err:  # noqa: BLE001
+                _LOGGER.warning(
+                    "Benchmark of profile '%s' with model %s failed: %s",
+                    profile_name, model_id, err,
+                )
+                measurement = None
+        return profile_name, model_id, len(text), measurement
+
+    runs = await asyncio.gather(
+        *(
+            _async_run(profile_name, model_id, text)
+            for (profile_name, model_id), text, _ in product(
+                combinations, sentences, range(repetitions)
+            )
+        )
+    )
+
+    results = []
+    for profile_name, model_id in combinations:
+        measured = [
+            (characters, measurement)
+            for name, model, characters, measurement in runs
+            if name == profile_name and model == model_id
+        ]
+        ok = [(characters, m) for characters, m in measured if m is not None]
+        result: dict[str, Any] = {
+            "profile": profile_name,
+            "model": model_id,
+            "runs": len(ok),
+            "errors": len(measured) - len(ok),
+        }
+        if ok:
+            total_time = sum(m[1] for _, m in ok)
+            result.update(
+                ttfb_ms=round(median(m[0] for _, m in ok) * 1000, 1),
+                total_ms=round(median(m[1] for _, m in ok) * 1000, 1),
+                audio_bytes_per_second=round(sum(m[2] for _, m in ok) / total_time, 1),
+                characters_per_second=round(sum(c for c, _ in ok) / total_time, 1),
+            )
+        results.append(result)
+    return results
+
+
+def _async_get_store(hass: HomeAssistant) -> Store:
+    """Return the store holding benchmark history."""
+    if DATA_BENCHMARK_STORE not in hass.data:
+        hass.data[DATA_BENCHMARK_STORE] = Store(
+            hass, BENCHMARK_STORAGE_VERSION, BENCHMARK_STORAGE_KEY
+        )
+    return hass.data[DATA_BENCHMARK_STORE]
+
+
+async def async_load_history(hass: HomeAssistant) -> list[dict[str, Any]]:
+    """Return the stored benchmark runs, oldest first."""
+    data = await _async_get_store(hass).async_load()
+    return data["runs"] if data else []
+
+
+async def async_save_run(hass: HomeAssistant, results: list[dict[str, Any]]) -> dict[str, Any]:
+    """Append a benchmark run to the stored history and return it.
+
+    Runs finishing at the same time are saved one after the other, so
+    neither is lost.
+    """
+    run = {"timestamp": dt_util.utcnow().isoformat(), "results": results}
+    lock = hass.data.setdefault(DATA_BENCHMARK_LOCK, asyncio.Lock())
+    async with lock:
+        history = await async_load_history(hass)
+        history.append(run)
+        await _async_get_store(hass).async_save({"runs": history[-BENCHMARK_HISTORY_SIZE:]})
+    return run
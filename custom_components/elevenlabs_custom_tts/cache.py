@@ -0,0 +1,328 @@
+"""Cache of synthesized audio keyed by canonical request.
+
+An in-memory LRU always sits in front; an optional shared backend (a
+directory on a shared mount or an HTTP key-value store) lets several Home
+Assistant instances reuse each other's audio.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import asyncio
+from collections import OrderedDict
+from collections.abc import Callable
+import logging
+import os
+from pathlib import Path
+import time
+from typing import NamedTuple
+import uuid
+
+import httpx
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.httpx_client import get_async_client
+
+from .const import (
+    AUDIO_CACHE_SIZE,
+    CACHE_BACKEND_DIRECTORY,
+    CACHE_BACKEND_HTTP,
+    CACHE_DIRECTORY_MAX_AGE,
+    CACHE_DIRECTORY_MAX_BYTES,
+    CACHE_DIRECTORY_PRUNE_INTERVAL,
+    CACHE_KEY_VERSION,
+    CACHE_SHARED_BACKOFF,
+    CACHE_SHARED_READ_TIMEOUT,
+    CACHE_SHARED_WRITE_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AudioEntry(NamedTuple):
+    """Synthesized audio and its playing time in seconds, if known."""
+
+    extension: str
+    data: bytes
+    duration: float | None = None
+
+
+def encode_entry(entry: AudioEntry) -> bytes:
+    """Serialize an entry as a header line (extension, duration) and the audio."""
+    header = entry.extension
+    if entry.duration is not None:
+        header += f" {entry.duration}"
+    return header.encode() + b"\n" + entry.data
+
+
+def decode_entry(payload: bytes) -> AudioEntry | None:
+    """Deserialize an entry, returning None if it is malformed."""
+    header, separator, data = payload.partition(b"\n")
+    extension, _, duration = header.partition(b" ")
+    if not separator or not data or not extension.isalnum():
+        return None
+    try:
+        return AudioEntry(extension.decode(), data, float(duration) if duration else None)
+    except ValueError:
+        return None
+
+
+class CacheBackend(ABC):
+    """Storage for synthesized audio."""
+
+    @abstractmethod
+    async def async_get(self, key: str) -> AudioEntry | None:
+        """Return the audio stored under a key."""
+
+    @abstractmethod
+    async def async_set(self, key: str, entry: AudioEntry) -> None:
+        """Store audio under a key."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Least-recently-used in-memory cache."""
+
+    def __init__(
+        self,
+        size: int = AUDIO_CACHE_SIZE,
+        on_evict: Callable[[str], None] | None = None,
+    ) -> None:
+        """Initialize the cache."""
+        self._size = size
+        self._on_evict = on_evict
+        self._entries: OrderedDict[str, AudioEntry] = OrderedDict()
+
+    async def async_get(self, key: str) -> AudioEntry | None:
+        """Return cached audio, marking it as recently used."""
+        if (entry := self._entries.get(key)) is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    async def async_set(self, key: str, entry: AudioEntry) -> None:
+        """Store audio, evicting the least recently used entry when full."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._size:
+            evicted, _ = self._entries.popitem(last=False)
+            if self._on_evict is not None:
+                self._on_evict(evicted)
+
+
+class DirectoryCacheBackend(CacheBackend):
+    """Audio files in a directory that may be shared between instances.
+
+    Files are written under a unique temporary name and atomically renamed
+    into place, so readers on other instances never see a partial file.
+    Reading a file refreshes its modification time; files unused for too
+    long, the least recently used files beyond the size limit and leftover
+    temporary files are pruned periodically.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        path: str,
+        max_age: float = CACHE_DIRECTORY_MAX_AGE,
+        max_bytes: int = CACHE_DIRECTORY_MAX_BYTES,
+    ) -> None:
+        """Initialize the backend."""
+        self._hass = hass
+        self._root = Path(path)
+        self._max_age = max_age
+        self._max_bytes = max_bytes
+        self._last_prune = 0.0
+
+    def _path(self, key: str) -> Path:
+        # Keys look like "v2-<hash>"; shard on the hash, per key version
+        version, _, digest = key.rpartition("-")
+        return self._root / version / digest[:2] / f"{key}.tts"
+
+    def _read(self, key: str) -> AudioEntry | None:
+        path = self._path(key)
+        try:
+            payload = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except OSError as err:
+            # A read-only share still serves its audio, it just ages out
+            _LOGGER.debug("Could not mark cached audio as used: %s", err)
+        return decode_entry(payload)
+
+    def _write(self, key: str, entry: AudioEntry) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            temp_path.write_bytes(encode_entry(entry))
+            os.replace(temp_path, path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    def prune(self, now: float | None = None) -> int:
+        """Delete expired and excess files, returning how many were deleted.
+
+        Other instances may prune the same directory at the same time, so
+        files vanishing underneath are expected.
+        """
+        now = time.time() if now is None else now
+        files: list[tuple[float, int, Path]] = []
+        deleted = 0
+        for path in self._root.rglob("*"):
+            if path.suffix not in (".tts", ".tmp"):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            age = now - stat.st_mtime
+            # Temporary files this old were left behind by a crashed writer
+            if age > self._max_age or (
+                path.suffix == ".tmp" and age > CACHE_DIRECTORY_PRUNE_INTERVAL
+            ):
+                path.unlink(missing_ok=True)
+                deleted += 1
+            elif path.suffix == ".tts":
+                files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self._max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            deleted += 1
+        return deleted
+
+    async def async_get(self, key: str) -> AudioEntry | None:
+        """Read audio from the directory."""
+        return await self._hass.async_add_executor_job(self._read, key)
+
+    async def async_set(self, key: str, entry: AudioEntry) -> None:
+        """Write audio to the directory, pruning it now and then."""
+        await self._hass.async_add_executor_job(self._write, key, entry)
+        if time.monotonic() - self._last_prune > CACHE_DIRECTORY_PRUNE_INTERVAL:
+            self._last_prune = time.monotonic()
+            deleted = await self._hass.async_add_executor_job(self.prune)
+            _LOGGER.debug("Pruned %d files from the shared audio cache", deleted)
+
+
+class HttpCacheBackend(CacheBackend):
+    """Key-value store reached with GET and PUT on {base_url}/{key}.
+
+    Works with any store exposing plain HTTP object access, such as a WebDAV
+    share or an object store gateway.
+    """
+
+    def __init__(self, hass: HomeAssistant, base_url: str) -> None:
+        """Initialize the backend."""
+        self._client = get_async_client(hass)
+        self._base_url = base_url.rstrip("/")
+
+    async def async_get(self, key: str) -> AudioEntry | None:
+        """Fetch audio from the store."""
+        response = await self._client.get(
+            f"{self._base_url}/{key}", timeout=CACHE_SHARED_READ_TIMEOUT
+        )
+        if response.status_code != 200:
+            return None
+        return decode_entry(response.content)
+
+    async def async_set(self, key: str, entry: AudioEntry) -> None:
+        """Upload audio to the store."""
+        response = await self._client.put(
+            f"{self._base_url}/{key}",
+            content=encode_entry(entry),
+            timeout=CACHE_SHARED_WRITE_TIMEOUT,
+        )
+        response.raise_for_status()
+
+
+def create_backend(hass: HomeAssistant, backend: str, location: str) -> CacheBackend | None:
+    """Return the configured shared backend, or None for memory only."""
+    if not location:
+        return None
+    if backend == CACHE_BACKEND_DIRECTORY:
+        return DirectoryCacheBackend(hass, location)
+    if backend == CACHE_BACKEND_HTTP:
+        return HttpCacheBackend(hass, location)
+    return None
+
+
+class AudioCache:
+    """In-memory cache in front of an optional shared backend.
+
+    Shared reads are bounded by a short timeout, and after any error the
+    shared backend is skipped for a while, so a slow or broken store never
+    delays synthesis by more than one short timeout.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, on_evict: Callable[[str], None] | None = None
+    ) -> None:
+        """Initialize the cache."""
+        self._hass = hass
+        self._memory = MemoryCacheBackend(on_evict=on_evict)
+        self._shared: CacheBackend | None = None
+        self._shared_config: tuple[str, str] | None = None
+        self._shared_backoff_until = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, backend: str, location: str) -> None:
+        """Switch the shared backend when the settings change."""
+        if self._shared_config == (backend, location):
+            return
+        self._shared_config = (backend, location)
+        self._shared = create_backend(self._hass, backend, location)
+        self._shared_backoff_until = 0.0
+
+    def _available_shared(self) -> CacheBackend | None:
+        """Return the shared backend unless it is backing off after an error."""
+        if time.monotonic() < self._shared_backoff_until:
+            return None
+        return self._shared
+
+    def _shared_failed(self) -> None:
+        """Skip the shared backend for a while."""
+        self._shared_backoff_until = time.monotonic() + CACHE_SHARED_BACKOFF
+
+    async def async_get(self, key: str, record: bool = True) -> AudioEntry | None:
+        """Return audio from memory, then from the shared backend.
+
+        Lookups made with record set to False do not count as hits or misses.
+        """
+        key = f"{CACHE_KEY_VERSION}-{key}"
+        entry = await self._memory.async_get(key)
+        if entry is None and (shared := self._available_shared()) is not None:
+            try:
+                entry = await asyncio.wait_for(shared.async_get(key), CACHE_SHARED_READ_TIMEOUT)
+            except (OSError, httpx.HTTPError, asyncio.TimeoutError) as err:
+                _LOGGER.debug("Error reading shared audio cache, skipping it for a while: %r", err)
+                self._shared_failed()
+            if entry is not None:
+                await self._memory.async_set(key, entry)
+        if record and entry is None:
+            self.misses += 1
+        elif record:
+            self.hits += 1
+        return entry
+
+    async def async_set(self, key: str, entry: AudioEntry) -> None:
+        """Store audio in memory and, in the background, in the shared backend."""
+        key = f"{CACHE_KEY_VERSION}-{key}"
+        await self._memory.async_set(key, entry)
+        if (shared := self._available_shared()) is not None:
+            self._hass.async_create_background_task(
+                self._async_set_shared(shared, key, entry),
+                "elevenlabs_custom_tts audio cache write",
+            )
+
+    async def _async_set_shared(self, shared: CacheBackend, key: str, entry: AudioEntry) -> None:
+        """Write to the shared backend, logging failures."""
+        try:
+            await shared.async_set(key, entry)
+        except (OSError, httpx.HTTPError) as err:
+            _LOGGER.warning("Error writing shared audio cache, skipping it for a while: %s", err)
+            self._shared_failed()
@@ -0,0 +1,56 @@
+"""Canonical form of TTS options, so identical requests share a cache key."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any
+
+from .const import OPTION_FLOAT_STEP
+
+
+def quantize(value: Any) -> Any:
+    """Round floats to the option step; leave other values unchanged."""
+    if isinstance(value, float):
+        return round(round(value / OPTION_FLOAT_STEP) * OPTION_FLOAT_STEP, 2)
+    return value
+
+
+def quantize_options(options: dict[str, Any]) -> dict[str, Any]:
+    """Return options with every float rounded to the option step."""
+    return {key: quantize(value) for key, value in options.items()}
+
+
+def canonicalize_options(
+    options: dict[str, Any], defaults: dict[str, Any]
+) -> dict[str, Any]:
+    """Return options in canonical form.
+
+    Floats are quantized, unset values and values equal to their default are
+    dropped, and keys are sorted.
+    """
+    canonical = {}
+    for key in sorted(options):
+        value = quantize(options[key])
+        if value is None or value == "" or (key in defaults and value == quantize(defaults[key])):
+            continue
+        canonical[key] = value
+    return canonical
+
+
+def audio_cache_key(
+    message: str, language: str, options: dict[str, Any], defaults: dict[str, Any]
+) -> str:
+    """Return a content-addressed key for the audio of a request."""
+    payload = json.dumps(
+        {
+            "message": " ".join(message.split()),
+            "language": language,
+            "options": canonicalize_options(options, defaults),
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
@@ -12,6 +12,7 @@ import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry, ConfigFlow, ConfigFlowResult, OptionsFlow
 from homeassistant.const import CONF_API_KEY
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er, selector
 from homeassistant.helpers.httpx_client import get_async_client
 
 from .const import (
@@ -23,6 +24,49 @@ from .const import (
     DEFAULT_SPEED,
     DEFAULT_USE_SPEAKER_BOOST,
     DEFAULT_APPLY_TEXT_NORMALIZATION,
+    CONF_HEDGE_MODE,
+    CONF_HEDGE_DELAY_MS,
+    CONF_HEDGE_PERCENTILE,
+    CONF_HEDGE_MODEL_ID,
+    CONF_HEDGE_API_KEY,
+    DEFAULT_HEDGE_MODE,
+    DEFAULT_HEDGE_DELAY_MS,
+    DEFAULT_HEDGE_PERCENTILE,
+    HEDGE_MODE_OFF,
+    HEDGE_MODE_INTERACTIVE,
+    HEDGE_MODE_ALWAYS,
+    CONF_FALLBACK_ENGINE,
+    CONF_FALLBACK_DEADLINE,
+    DEFAULT_FALLBACK_ENGINE,
+    DEFAULT_FALLBACK_DEADLINE,
+    AUDIO_FORMAT_MP3,
+    AUDIO_FORMAT_WAV,
+    DEFAULT_AUDIO_FORMAT,
+    DEFAULT_TARGET_LUFS,
+    LOUDNORM_MAX_LUFS,
+    LOUDNORM_MIN_LUFS,
+    DEFAULT_POST_SAMPLE_RATE,
+    CONF_TRACE_ENABLED,
+    CONF_TRACE_LOG,
+    DEFAULT_TRACE_ENABLED,
+    DEFAULT_TRACE_LOG,
+    MODEL_IDS,
+    CONF_MODEL_ROUTING,
+    DEFAULT_MODEL_ROUTING,
+    CONF_CACHE_BACKEND,
+    CONF_CACHE_LOCATION,
+    DEFAULT_CACHE_BACKEND,
+    DEFAULT_CACHE_LOCATION,
+    CACHE_BACKEND_MEMORY,
+    CACHE_BACKEND_DIRECTORY,
+    CACHE_BACKEND_HTTP,
+    CONF_PRESYNTH_ENABLED,
+    CONF_PRESYNTH_TOP_N,
+    CONF_PRESYNTH_TEMPLATES,
+    DEFAULT_PRESYNTH_ENABLED,
+    DEFAULT_PRESYNTH_TOP_N,
+    DEFAULT_PRESYNTH_TEMPLATES,
+    AUDIO_CACHE_SIZE,
 )
 
 # Schema field mappings for user-friendly labels
@@ -35,6 +79,50 @@ STYLE_KEY = "Style Exaggeration (0.0-1.0)"
 SPEED_KEY = "Speech Speed (0.25-4.0)"
 SPEAKER_BOOST_KEY = "Enable Speaker Boost"
 APPLY_TEXT_NORMALIZATION_KEY = "Apply Text Normalization"
+FALLBACK_VOICE_KEY = "Fallback Engine Voice (optional)"
+AUDIO_FORMAT_KEY = "Audio Format"
+TRIM_SILENCE_KEY = "Trim Leading/Trailing Silence"
+TARGET_LUFS_KEY = "Target Loudness in LUFS (0 = off)"
+SAMPLE_RATE_KEY = "Resample to Hz (0 = keep)"
+DOWNMIX_KEY = "Downmix to Mono"
+
+SAMPLE_RATE_OPTIONS = [0, 16000, 22050, 24000, 44100, 48000]
+
+# Advanced settings field mappings
+HEDGE_MODE_KEY = "Hedge Slow Requests"
+HEDGE_DELAY_KEY = "Hedge Delay in ms (0 = learn from latency)"
+HEDGE_PERCENTILE_KEY = "Learned Hedge Delay Percentile"
+HEDGE_MODEL_KEY = "Hedge Model (blank = same model)"
+HEDGE_API_KEY_KEY = "Hedge API Key (blank = same key)"
+FALLBACK_ENGINE_KEY = "Fallback TTS Entity (e.g. tts.piper)"
+FALLBACK_DEADLINE_KEY = "Fallback Deadline in seconds (0 = none)"
+TRACE_ENABLED_KEY = "Record Request Traces"
+TRACE_LOG_KEY = "Log Request Traces"
+MODEL_ROUTING_KEY = "Route Short and Interactive Requests to Faster Models"
+CACHE_BACKEND_KEY = "Shared Audio Cache"
+CACHE_LOCATION_KEY = "Shared Audio Cache Location (directory or URL)"
+PRESYNTH_ENABLED_KEY = "Pre-Synthesize Frequent Announcements"
+PRESYNTH_TOP_N_KEY = "Number of Announcements to Pre-Synthesize"
+PRESYNTH_TEMPLATES_KEY = "Pre-Synthesis Templates (one per line)"
+
+# Maps each settings option key to its friendly form key and default
+SETTINGS_FIELDS = {
+    CONF_HEDGE_MODE: (HEDGE_MODE_KEY, DEFAULT_HEDGE_MODE),
+    CONF_HEDGE_DELAY_MS: (HEDGE_DELAY_KEY, DEFAULT_HEDGE_DELAY_MS),
+    CONF_HEDGE_PERCENTILE: (HEDGE_PERCENTILE_KEY, DEFAULT_HEDGE_PERCENTILE),
+    CONF_HEDGE_MODEL_ID: (HEDGE_MODEL_KEY, ""),
+    CONF_HEDGE_API_KEY: (HEDGE_API_KEY_KEY, ""),
+    CONF_FALLBACK_ENGINE: (FALLBACK_ENGINE_KEY, DEFAULT_FALLBACK_ENGINE),
+    CONF_FALLBACK_DEADLINE: (FALLBACK_DEADLINE_KEY, DEFAULT_FALLBACK_DEADLINE),
+    CONF_TRACE_ENABLED: (TRACE_ENABLED_KEY, DEFAULT_TRACE_ENABLED),
+    CONF_TRACE_LOG: (TRACE_LOG_KEY, DEFAULT_TRACE_LOG),
+    CONF_MODEL_ROUTING: (MODEL_ROUTING_KEY, DEFAULT_MODEL_ROUTING),
+    CONF_CACHE_BACKEND: (CACHE_BACKEND_KEY, DEFAULT_CACHE_BACKEND),
+    CONF_CACHE_LOCATION: (CACHE_LOCATION_KEY, DEFAULT_CACHE_LOCATION),
+    CONF_PRESYNTH_ENABLED: (PRESYNTH_ENABLED_KEY, DEFAULT_PRESYNTH_ENABLED),
+    CONF_PRESYNTH_TOP_N: (PRESYNTH_TOP_N_KEY, DEFAULT_PRESYNTH_TOP_N),
+    CONF_PRESYNTH_TEMPLATES: (PRESYNTH_TEMPLATES_KEY, DEFAULT_PRESYNTH_TEMPLATES),
+}
 
 def _map_form_data_to_profile(user_input: dict[str, Any]) -> dict[str, Any]:
     """Map form data with friendly keys back to profile data with standard keys."""
@@ -47,6 +135,12 @@ def _map_form_data_to_profile(user_input: dict[str, Any]) -> dict[str, Any]:
         "speed": user_input.get(SPEED_KEY, DEFAULT_SPEED),
         "use_speaker_boost": user_input.get(SPEAKER_BOOST_KEY, DEFAULT_USE_SPEAKER_BOOST),
         "apply_text_normalization": user_input.get(APPLY_TEXT_NORMALIZATION_KEY, DEFAULT_APPLY_TEXT_NORMALIZATION),
+        "fallback_voice": user_input.get(FALLBACK_VOICE_KEY, ""),
+        "audio_format": user_input.get(AUDIO_FORMAT_KEY, DEFAULT_AUDIO_FORMAT),
+        "trim_silence": user_input.get(TRIM_SILENCE_KEY, False),
+        "target_lufs": user_input.get(TARGET_LUFS_KEY, DEFAULT_TARGET_LUFS),
+        "sample_rate": user_input.get(SAMPLE_RATE_KEY, DEFAULT_POST_SAMPLE_RATE),
+        "downmix": user_input.get(DOWNMIX_KEY, False),
     }
 
 def _map_profile_to_form_data(profile_name: str, profile_data: dict[str, Any]) -> dict[str, Any]:
@@ -61,7 +155,78 @@ def _map_profile_to_form_data(profile_name: str, profile_data: dict[str, Any]) -
         SPEED_KEY: profile_data.get("speed", DEFAULT_SPEED),
         SPEAKER_BOOST_KEY: profile_data.get("use_speaker_boost", DEFAULT_USE_SPEAKER_BOOST),
         APPLY_TEXT_NORMALIZATION_KEY: profile_data.get("apply_text_normalization", DEFAULT_APPLY_TEXT_NORMALIZATION),
+        FALLBACK_VOICE_KEY: profile_data.get("fallback_voice", ""),
+        AUDIO_FORMAT_KEY: profile_data.get("audio_format", DEFAULT_AUDIO_FORMAT),
+        TRIM_SILENCE_KEY: profile_data.get("trim_silence", False),
+        TARGET_LUFS_KEY: profile_data.get("target_lufs", DEFAULT_TARGET_LUFS),
+        SAMPLE_RATE_KEY: profile_data.get("sample_rate", DEFAULT_POST_SAMPLE_RATE),
+        DOWNMIX_KEY: profile_data.get("downmix", False),
+    }
+
+def _map_form_data_to_settings(user_input: dict[str, Any]) -> dict[str, Any]:
+    """Map advanced settings form data with friendly keys to option keys."""
+    return {
+        option_key: user_input.get(form_key, default)
+        for option_key, (form_key, default) in SETTINGS_FIELDS.items()
+    }
+
+def _settings_schema(options: dict[str, Any], own_entities: list[str]) -> vol.Schema:
+    """Return the advanced settings schema, defaulting to the current options.
+
+    The fallback engine may be any TTS entity except this integration's own.
+    Optional fields without a default can be cleared.
+    """
+    current = {
+        form_key: options.get(option_key, default)
+        for option_key, (form_key, default) in SETTINGS_FIELDS.items()
     }
+    return vol.Schema({
+        vol.Optional(HEDGE_MODE_KEY, default=current[HEDGE_MODE_KEY]): vol.In({
+            HEDGE_MODE_OFF: "Off",
+            HEDGE_MODE_INTERACTIVE: "Interactive requests only (priority: interactive)",
+            HEDGE_MODE_ALWAYS: "All requests",
+        }),
+        vol.Optional(HEDGE_DELAY_KEY, default=current[HEDGE_DELAY_KEY]): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=30000)
+        ),
+        vol.Optional(HEDGE_PERCENTILE_KEY, default=current[HEDGE_PERCENTILE_KEY]): vol.All(
+            vol.Coerce(int), vol.Range(min=50, max=99)
+        ),
+        vol.Optional(HEDGE_MODEL_KEY, default=current[HEDGE_MODEL_KEY]): vol.In({
+            "": "Same model",
+            **{model: model for model in MODEL_IDS},
+        }),
+        vol.Optional(
+            HEDGE_API_KEY_KEY, description={"suggested_value": current[HEDGE_API_KEY_KEY]}
+        ): selector.TextSelector(
+            selector.TextSelectorConfig(type=selector.TextSelectorType.PASSWORD)
+        ),
+        vol.Optional(
+            FALLBACK_ENGINE_KEY, description={"suggested_value": current[FALLBACK_ENGINE_KEY]}
+        ): selector.EntitySelector(
+            selector.EntitySelectorConfig(domain="tts", exclude_entities=own_entities)
+        ),
+        vol.Optional(FALLBACK_DEADLINE_KEY, default=current[FALLBACK_DEADLINE_KEY]): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=30)
+        ),
+        vol.Optional(TRACE_ENABLED_KEY, default=current[TRACE_ENABLED_KEY]): bool,
+        vol.Optional(TRACE_LOG_KEY, default=current[TRACE_LOG_KEY]): bool,
+        vol.Optional(MODEL_ROUTING_KEY, default=current[MODEL_ROUTING_KEY]): bool,
+        vol.Optional(CACHE_BACKEND_KEY, default=current[CACHE_BACKEND_KEY]): vol.In({
+            CACHE_BACKEND_MEMORY: "Off (this instance only)",
+            CACHE_BACKEND_DIRECTORY: "Shared directory",
+            CACHE_BACKEND_HTTP: "HTTP key-value store",
+        }),
+        vol.Optional(CACHE_LOCATION_KEY, default=current[CACHE_LOCATION_KEY]): str,
+        vol.Optional(PRESYNTH_ENABLED_KEY, default=current[PRESYNTH_ENABLED_KEY]): bool,
+        # Leave room in the audio cache for other announcements
+        vol.Optional(PRESYNTH_TOP_N_KEY, default=current[PRESYNTH_TOP_N_KEY]): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=AUDIO_CACHE_SIZE // 2)
+        ),
+        vol.Optional(
+            PRESYNTH_TEMPLATES_KEY, default=current[PRESYNTH_TEMPLATES_KEY]
+        ): selector.TextSelector(selector.TextSelectorConfig(multiline=True)),
+    })
 
 USER_STEP_SCHEMA = vol.Schema({vol.Required(CONF_API_KEY): str})
 
@@ -157,6 +322,8 @@ class ElevenLabsOptionsFlow(OptionsFlow):
                 return await self.async_step_modify_profile()
             elif user_input.get("action") == "delete_profile":
                 return await self.async_step_delete_profile()
+            elif user_input.get("action") == "advanced_settings":
+                return await self.async_step_advanced_settings()
             elif user_input.get("action") == "done":
                 return self.async_create_entry(title="", data=self._config_entry.options)
         
@@ -171,6 +338,7 @@ class ElevenLabsOptionsFlow(OptionsFlow):
                     "add_profile": "Add New Voice Profile",
                     "modify_profile": "Modify Existing Profile", 
                     "delete_profile": "Delete Voice Profile",
+                    "advanced_settings": "Advanced Settings",
                     "done": "Finish Configuration"
                 })
             }),
@@ -208,12 +376,7 @@ class ElevenLabsOptionsFlow(OptionsFlow):
             data_schema=vol.Schema({
                 vol.Required(PROFILE_NAME_KEY): str,
                 vol.Required(VOICE_ID_KEY): str,
-                vol.Optional(MODEL_KEY, default=DEFAULT_MODEL): vol.In([
-                    "eleven_turbo_v2_5",
-                    "eleven_multilingual_v2", 
-                    "eleven_monolingual_v1",
-                    "eleven_turbo_v2"
-                ]),
+                vol.Optional(MODEL_KEY, default=DEFAULT_MODEL): vol.In(MODEL_IDS),
                 vol.Optional(STABILITY_KEY, default=DEFAULT_STABILITY): vol.All(
                     vol.Coerce(float), vol.Range(min=0, max=1)
                 ),
@@ -232,6 +395,18 @@ class ElevenLabsOptionsFlow(OptionsFlow):
                     "off",
                     "auto"
                 ]),
+                vol.Optional(FALLBACK_VOICE_KEY, default=""): str,
+                vol.Optional(AUDIO_FORMAT_KEY, default=DEFAULT_AUDIO_FORMAT): vol.In([
+                    AUDIO_FORMAT_MP3,
+                    AUDIO_FORMAT_WAV
+                ]),
+                vol.Optional(TRIM_SILENCE_KEY, default=False): bool,
+                vol.Optional(TARGET_LUFS_KEY, default=DEFAULT_TARGET_LUFS): vol.All(
+                    vol.Coerce(float),
+                    vol.Any(0, vol.Range(min=LOUDNORM_MIN_LUFS, max=LOUDNORM_MAX_LUFS)),
+                ),
+                vol.Optional(SAMPLE_RATE_KEY, default=DEFAULT_POST_SAMPLE_RATE): vol.In(SAMPLE_RATE_OPTIONS),
+                vol.Optional(DOWNMIX_KEY, default=False): bool,
             }),
             errors=errors,
         )
@@ -256,12 +431,7 @@ class ElevenLabsOptionsFlow(OptionsFlow):
                     data_schema=vol.Schema({
                         vol.Required(PROFILE_NAME_KEY, default=form_data[PROFILE_NAME_KEY]): str,
                         vol.Required(VOICE_ID_KEY, default=form_data[VOICE_ID_KEY]): str,
-                        vol.Optional(MODEL_KEY, default=form_data[MODEL_KEY]): vol.In([
-                            "eleven_turbo_v2_5",
-                            "eleven_multilingual_v2", 
-                            "eleven_monolingual_v1",
-                            "eleven_turbo_v2"
-                        ]),
+                        vol.Optional(MODEL_KEY, default=form_data[MODEL_KEY]): vol.In(MODEL_IDS),
                         vol.Optional(STABILITY_KEY, default=form_data[STABILITY_KEY]): vol.All(
                             vol.Coerce(float), vol.Range(min=0, max=1)
                         ),
@@ -280,6 +450,18 @@ class ElevenLabsOptionsFlow(OptionsFlow):
                             "off",
                             "auto"
                         ]),
+                        vol.Optional(FALLBACK_VOICE_KEY, default=form_data[FALLBACK_VOICE_KEY]): str,
+                        vol.Optional(AUDIO_FORMAT_KEY, default=form_data[AUDIO_FORMAT_KEY]): vol.In([
+                            AUDIO_FORMAT_MP3,
+                            AUDIO_FORMAT_WAV
+                        ]),
+                        vol.Optional(TRIM_SILENCE_KEY, default=form_data[TRIM_SILENCE_KEY]): bool,
+                        vol.Optional(TARGET_LUFS_KEY, default=form_data[TARGET_LUFS_KEY]): vol.All(
+                            vol.Coerce(float),
+                            vol.Any(0, vol.Range(min=LOUDNORM_MIN_LUFS, max=LOUDNORM_MAX_LUFS)),
+                        ),
+                        vol.Optional(SAMPLE_RATE_KEY, default=form_data[SAMPLE_RATE_KEY]): vol.In(SAMPLE_RATE_OPTIONS),
+                        vol.Optional(DOWNMIX_KEY, default=form_data[DOWNMIX_KEY]): bool,
                     })
                 )
         
@@ -359,4 +541,28 @@ class ElevenLabsOptionsFlow(OptionsFlow):
             data_schema=vol.Schema({
                 vol.Required("profile_name"): vol.In(list(current_profiles.keys()))
             })
-        )
\ No newline at end of file
+        )
+
+    async def async_step_advanced_settings(self, user_input: dict[str, Any] | None = None):
+        """Edit integration-wide performance settings."""
+        errors = {}
+        registry = er.async_get(self.hass)
+        own_entities = [
+            entry.entity_id for entry in registry.entities.values() if entry.platform == DOMAIN
+        ]
+        
+        if user_input is not None:
+            settings = _map_form_data_to_settings(user_input)
+            # Falling back to ourselves would loop through the TTS manager
+            if settings[CONF_FALLBACK_ENGINE] in own_entities:
+                errors["base"] = "fallback_engine_self"
+            else:
+                new_options = self._config_entry.options.copy()
+                new_options.update(settings)
+                return self.async_create_entry(title="", data=new_options)
+        
+        return self.async_show_form(
+            step_id="advanced_settings",
+            data_schema=_settings_schema(self._config_entry.options, own_entities),
+            errors=errors,
+        )
@@ -8,6 +8,7 @@ CONF_API_KEY = "api_key"
 # Service names
 SERVICE_GET_VOICES = "get_voices"
 SERVICE_GENERATE_VOICE = "generate_voice"
+SERVICE_BENCHMARK_PROFILES = "benchmark_profiles"
 
 # Service parameters
 ATTR_TEXT = "text"
@@ -23,6 +24,14 @@ ATTR_SPEED = "speed"
 ATTR_OUTPUT_PATH = "output_path"
 ATTR_APPLY_TEXT_NORMALIZATION = "apply_text_normalization"
 
+# Benchmark parameters
+ATTR_PROFILES = "profiles"
+ATTR_MODELS = "models"
+ATTR_SENTENCES = "sentences"
+ATTR_REPETITIONS = "repetitions"
+ATTR_CONCURRENCY = "concurrency"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+
 # Voice filtering parameters
 ATTR_VOICE_TYPE = "voice_type"
 ATTR_SEARCH_TEXT = "search_text"
@@ -38,3 +47,155 @@ DEFAULT_STYLE = 0.0
 DEFAULT_SPEED = 1.0
 DEFAULT_USE_SPEAKER_BOOST = True
 DEFAULT_APPLY_TEXT_NORMALIZATION = "auto"
+
+# Request priority (passed as the "priority" TTS option)
+ATTR_PRIORITY = "priority"
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BACKGROUND = "background"
+
+# Hedged request settings (stored in config entry options)
+CONF_HEDGE_MODE = "hedge_mode"
+CONF_HEDGE_DELAY_MS = "hedge_delay_ms"
+CONF_HEDGE_PERCENTILE = "hedge_percentile"
+CONF_HEDGE_MODEL_ID = "hedge_model_id"
+CONF_HEDGE_API_KEY = "hedge_api_key"
+
+HEDGE_MODE_OFF = "off"
+HEDGE_MODE_INTERACTIVE = "interactive"
+HEDGE_MODE_ALWAYS = "always"
+
+DEFAULT_HEDGE_MODE = HEDGE_MODE_OFF
+DEFAULT_HEDGE_DELAY_MS = 0  # 0 = learn the delay from observed time-to-first-byte
+DEFAULT_HEDGE_PERCENTILE = 90
+DEFAULT_HEDGE_FALLBACK_DELAY = 1.0  # seconds, used until enough samples are collected
+HEDGE_MIN_SAMPLES = 20
+HEDGE_HISTORY_SIZE = 200
+
+# Fallback engine settings (stored in config entry options)
+CONF_FALLBACK_ENGINE = "fallback_engine"
+CONF_FALLBACK_DEADLINE = "fallback_deadline"
+
+DEFAULT_FALLBACK_ENGINE = ""
+DEFAULT_FALLBACK_DEADLINE = 0.0  # seconds, 0 = no deadline
+
+# Circuit breaker for the ElevenLabs API
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_RESET_TIMEOUT = 60  # seconds
+CIRCUIT_QUOTA_RESET_TIMEOUT = 900  # seconds
+
+ENGINE_ELEVENLABS = "elevenlabs"
+
+# Audio post-processing (per voice profile)
+AUDIO_FORMAT_MP3 = "mp3"
+AUDIO_FORMAT_WAV = "wav"
+DEFAULT_AUDIO_FORMAT = AUDIO_FORMAT_MP3
+PCM_OUTPUT_FORMAT = "pcm_24000"
+PCM_SAMPLE_RATE = 24000
+DEFAULT_TARGET_LUFS = 0.0  # 0 = no loudness normalization
+# Integrated loudness targets accepted by ffmpeg's loudnorm filter
+LOUDNORM_MIN_LUFS = -70.0
+LOUDNORM_MAX_LUFS = -5.0
+DEFAULT_POST_SAMPLE_RATE = 0  # 0 = keep the source sample rate
+SILENCE_THRESHOLD_DBFS = -50
+SILENCE_PADDING_MS = 20
+
+# Request tracing (stored in config entry options)
+CONF_TRACE_ENABLED = "trace_enabled"
+CONF_TRACE_LOG = "trace_log"
+
+DEFAULT_TRACE_ENABLED = False
+DEFAULT_TRACE_LOG = False
+TRACE_BUFFER_SIZE = 100
+
+# Multi-voice dialogue markup, e.g. "[voice:Butler] Good evening."
+DIALOGUE_TAG_PREFIX = "[voice:"
+MAX_DIALOGUE_CONCURRENCY = 4
+
+# ElevenLabs models: relative latency rank (lower is faster) and languages
+MULTILINGUAL_V2_LANGUAGES = [
+    "en", "ja", "zh", "de", "hi", "fr", "ko", "pt", "it", "es", "id", "nl", "tr",
+    "fil", "pl", "sv", "bg", "ro", "ar", "cs", "el", "fi", "hr", "ms", "sk", "da",
+    "ta", "uk", "ru",
+]
+V2_5_LANGUAGES = [*MULTILINGUAL_V2_LANGUAGES, "hu", "no", "vi"]
+MODELS = {
+    "eleven_flash_v2_5": (1, V2_5_LANGUAGES),
+    "eleven_flash_v2": (1, ["en"]),
+    "eleven_turbo_v2_5": (2, V2_5_LANGUAGES),
+    "eleven_turbo_v2": (2, ["en"]),
+    "eleven_monolingual_v1": (3, ["en"]),
+    "eleven_multilingual_v2": (4, MULTILINGUAL_V2_LANGUAGES),
+}
+MODEL_IDS = list(MODELS)
+# Models that reject apply_text_normalization "on"
+NO_FORCED_NORMALIZATION_MODELS = ["eleven_turbo_v2_5", "eleven_flash_v2_5"]
+
+# Latency-aware model routing (stored in config entry options)
+CONF_MODEL_ROUTING = "model_routing"
+DEFAULT_MODEL_ROUTING = False
+ROUTING_SHORT_MESSAGE_CHARS = 120
+ROUTING_STREAMING_LATENCY = 3
+
+# Canonical options and the synthesized-audio cache
+OPTION_FLOAT_STEP = 0.01
+AUDIO_CACHE_SIZE = 32
+
+# ElevenLabs REST API
+ELEVENLABS_API_URL = "https://api.elevenlabs.io"
+VOICES_REQUEST_TIMEOUT = 30
+
+# Entry lifecycle
+DATA_CLIENT_REGISTRY = f"{DOMAIN}_clients"
+DRAIN_TIMEOUT = 15  # seconds to let in-flight requests finish on unload
+
+# Benchmarking
+BENCHMARK_SENTENCES = [
+    "The front door is unlocked.",
+    "Good morning! It is seven degrees outside with light rain expected this afternoon.",
+    "The washing machine has finished. Please remember to hang the laundry before dinner.",
+]
+DEFAULT_BENCHMARK_REPETITIONS = 1
+DEFAULT_BENCHMARK_CONCURRENCY = 2
+MAX_BENCHMARK_REPETITIONS = 5
+MAX_BENCHMARK_CONCURRENCY = 4
+BENCHMARK_HISTORY_SIZE = 50
+BENCHMARK_STORAGE_KEY = f"{DOMAIN}.benchmarks"
+BENCHMARK_STORAGE_VERSION = 1
+DATA_BENCHMARK_STORE = f"{DOMAIN}_benchmarks"
+DATA_BENCHMARK_LOCK = f"{DOMAIN}_benchmarks_lock"
+
+# Shared audio cache backend (stored in config entry options)
+CONF_CACHE_BACKEND = "cache_backend"
+CONF_CACHE_LOCATION = "cache_location"
+
+CACHE_BACKEND_MEMORY = "memory"
+CACHE_BACKEND_DIRECTORY = "directory"
+CACHE_BACKEND_HTTP = "http"
+
+DEFAULT_CACHE_BACKEND = CACHE_BACKEND_MEMORY
+DEFAULT_CACHE_LOCATION = ""
+CACHE_SHARED_READ_TIMEOUT = 0.5  # seconds, a miss must not delay synthesis
+CACHE_SHARED_WRITE_TIMEOUT = 5  # seconds, writes run in the background
+CACHE_SHARED_BACKOFF = 60  # seconds the shared backend is skipped after an error
+CACHE_DIRECTORY_MAX_AGE = 30 * 24 * 3600  # seconds since a file was last used
+CACHE_DIRECTORY_MAX_BYTES = 500 * 1024 * 1024
+CACHE_DIRECTORY_PRUNE_INTERVAL = 3600  # seconds
+CACHE_KEY_VERSION = "v2"
+
+# Speculative pre-synthesis (stored in config entry options)
+CONF_PRESYNTH_ENABLED = "presynthesis_enabled"
+CONF_PRESYNTH_TOP_N = "presynthesis_top_n"
+CONF_PRESYNTH_TEMPLATES = "presynthesis_templates"
+
+DEFAULT_PRESYNTH_ENABLED = False
+DEFAULT_PRESYNTH_TOP_N = 10
+DEFAULT_PRESYNTH_TEMPLATES = ""
+
+PRESYNTH_HISTORY_SIZE = 50  # Messages remembered per voice profile
+PRESYNTH_MAX_COUNT = 1000  # Counts are halved when one reaches this
+PRESYNTH_IDLE_DELAY = 30  # Seconds without changes before warming the cache
+PRESYNTH_MAX_ENTRIES = AUDIO_CACHE_SIZE // 2  # Cache entries one warm pass may fill
+PRESYNTH_TEMPLATE_RATE_LIMIT = 60  # Seconds between renders of a template
+PRESYNTH_SAVE_DELAY = 60  # Seconds
+PRESYNTH_STORAGE_KEY = f"{DOMAIN}.presynthesis"
+PRESYNTH_STORAGE_VERSION = 1
@@ -0,0 +1,28 @@
+"""Diagnostics support for ElevenLabs Custom TTS."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_API_KEY
+from homeassistant.core import HomeAssistant
+
+from .benchmark import async_load_history
+from .const import CONF_HEDGE_API_KEY, DOMAIN
+
+TO_REDACT = {CONF_API_KEY, CONF_HEDGE_API_KEY}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    runtime_data = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    return {
+        "data": async_redact_data(entry.data, TO_REDACT),
+        "options": async_redact_data(entry.options, TO_REDACT),
+        "traces": runtime_data.tracer.as_list() if runtime_data else [],
+        "benchmarks": await async_load_history(hass),
+    }
@@ -0,0 +1,46 @@
+"""Multi-voice dialogue markup for TTS messages.
+
+A message such as::
+
+    [voice:Butler] Good evening. [voice:Security System] The alarm is armed.
+
+is split into segments, each spoken with the named voice profile. Text
+before the first tag uses the profile of the request itself.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import NamedTuple
+
+from .const import DIALOGUE_TAG_PREFIX
+
+DIALOGUE_TAG = re.compile(r"\[voice:\s*([^\]]*?)\s*\]", re.IGNORECASE)
+
+
+class DialogueSegment(NamedTuple):
+    """A part of a message spoken with one voice profile."""
+
+    profile: str | None
+    text: str
+
+
+def parse_dialogue(message: str) -> list[DialogueSegment] | None:
+    """Split a message into dialogue segments.
+
+    Returns None when the message contains no dialogue markup.
+    """
+    if DIALOGUE_TAG_PREFIX not in message.lower():
+        return None
+
+    segments = []
+    profile = None
+    position = 0
+    for match in DIALOGUE_TAG.finditer(message):
+        if text := message[position:match.start()].strip():
+            segments.append(DialogueSegment(profile, text))
+        profile = match.group(1) or None
+        position = match.end()
+    if text := message[position:].strip():
+        segments.append(DialogueSegment(profile, text))
+    return segments
@@ -0,0 +1,120 @@
+"""Fallback TTS engine used when ElevenLabs is slow or unreachable."""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+import logging
+import time
+from typing import Any
+
+from elevenlabs.core import ApiError
+
+from homeassistant.components.tts import (
+    async_get_media_source_audio,
+    generate_media_source_id,
+)
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_QUOTA_RESET_TIMEOUT,
+    CIRCUIT_RESET_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+QUOTA_ERROR_MARKERS = ("quota_exceeded", "insufficient_credits")
+
+
+def is_quota_error(err: ApiError) -> bool:
+    """Return True if an API error means the account quota is exhausted."""
+    return err.status_code in (401, 402) and any(
+        marker in str(err.body) for marker in QUOTA_ERROR_MARKERS
+    )
+
+
+class CircuitBreaker:
+    """Stop calling ElevenLabs for a while after repeated failures.
+
+    The circuit opens after a number of consecutive failures, or at once when
+    the quota is exhausted. Once the reset timeout passes a single trial
+    request is let through; its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the circuit breaker."""
+        self._failures = 0
+        self._open_until = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while requests are being short-circuited."""
+        return time.monotonic() < self._open_until
+
+    @property
+    def is_closed(self) -> bool:
+        """Return True while no failures are holding requests back."""
+        return self._failures < CIRCUIT_FAILURE_THRESHOLD and not self._open_until
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent to ElevenLabs."""
+        if self.is_closed:
+            return True
+        if self.is_open or self._trial_in_flight:
+            return False
+        self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        self._failures = 0
+        self._open_until = 0.0
+        self._trial_in_flight = False
+
+    def record_cancelled(self) -> None:
+        """Release the trial slot of a request abandoned by its caller."""
+        self._trial_in_flight = False
+
+    def record_failure(self, quota_exhausted: bool = False) -> None:
+        """Count a failure, opening the circuit when the threshold is reached."""
+        self._failures += 1
+        self._trial_in_flight = False
+        if quota_exhausted:
+            self._open_until = time.monotonic() + CIRCUIT_QUOTA_RESET_TIMEOUT
+        elif self._failures >= CIRCUIT_FAILURE_THRESHOLD:
+            self._open_until = time.monotonic() + CIRCUIT_RESET_TIMEOUT
+
+
+@dataclass
+class EngineStats:
+    """Track which engine served each request."""
+
+    served: Counter[str] = field(default_factory=Counter)
+    last_engine: str | None = None
+    last_fallback_reason: str | None = None
+
+    def record(self, engine: str, reason: str | None = None) -> None:
+        """Record the engine that served a request."""
+        self.served[engine] += 1
+        self.last_engine = engine
+        if reason:
+            self.last_fallback_reason = reason
+
+
+async def async_get_fallback_audio(
+    hass: HomeAssistant,
+    engine: str,
+    message: str,
+    language: str,
+    voice: str | None = None,
+) -> tuple[str | None, bytes | None]:
+    """Synthesize a message with another Home Assistant TTS entity."""
+    options: dict[str, Any] = {}
+    if voice:
+        options["voice"] = voice
+    media_source_id = generate_media_source_id(
+        hass, message, engine=engine, language=language, options=options
+    )
+    return await async_get_media_source_audio(hass, media_source_id)
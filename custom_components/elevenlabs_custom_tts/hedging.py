@@ -0,0 +1,180 @@
+"""Hedged ElevenLabs requests for latency-critical TTS."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+import logging
+import math
+import time
+from typing import Any
+
+from elevenlabs import AsyncElevenLabs
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DEFAULT_HEDGE_FALLBACK_DELAY,
+    HEDGE_HISTORY_SIZE,
+    HEDGE_MIN_SAMPLES,
+)
+from .lifecycle import async_get_client_registry
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class HedgeStats:
+    """Counters describing how often hedging fires and wins."""
+
+    hedged_requests: int = 0
+    fired: int = 0
+    won: int = 0
+    extra_characters: int = 0
+
+
+async def _async_first_chunk(audio_generator: AsyncIterator[bytes]) -> bytes:
+    """Wait for the first audio chunk of a stream, skipping empty chunks."""
+    async for chunk in audio_generator:
+        if chunk:
+            return chunk
+    return b""
+
+
+async def async_close_stream(audio_generator: AsyncIterator[bytes]) -> None:
+    """Close an audio stream, releasing its HTTP connection."""
+    try:
+        await audio_generator.aclose()
+    except Exception as err:  # noqa: BLE001
+        _LOGGER.debug("Error closing audio stream: %s", err)
+
+
+class HedgeController:
+    """Open ElevenLabs audio streams, optionally hedging slow first bytes.
+
+    Every stream opened through the controller contributes its
+    time-to-first-byte to a rolling history, which is used to learn the
+    hedge delay when no fixed delay is configured. The client for an
+    alternative API key is held through the shared client registry.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the controller."""
+        self._hass = hass
+        self._ttfb: deque[float] = deque(maxlen=HEDGE_HISTORY_SIZE)
+        self._api_key: str | None = None
+        self._client: AsyncElevenLabs | None = None
+        self.stats = HedgeStats()
+
+    def hedge_delay(self, delay_ms: int, percentile: float) -> float:
+        """Return the hedge delay in seconds.
+
+        A configured delay wins; otherwise the given percentile of the
+        observed time-to-first-byte is used once enough samples exist.
+        """
+        if delay_ms:
+            return delay_ms / 1000
+        if len(self._ttfb) < HEDGE_MIN_SAMPLES:
+            return DEFAULT_HEDGE_FALLBACK_DELAY
+        ordered = sorted(self._ttfb)
+        index = max(0, min(len(ordered) - 1, math.ceil(percentile / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    def client_for(self, api_key: str | None, default: AsyncElevenLabs) -> AsyncElevenLabs:
+        """Return a client for an alternative API key, or the default client."""
+        if api_key != self._api_key:
+            self.release()
+            if api_key:
+                self._client = async_get_client_registry(self._hass).acquire(api_key)
+                self._api_key = api_key
+        return self._client or default
+
+    def release(self) -> None:
+        """Release the client held for an alternative API key."""
+        if self._api_key:
+            async_get_client_registry(self._hass).release(self._api_key)
+        self._api_key = None
+        self._client = None
+
+    async def async_open(
+        self,
+        client: AsyncElevenLabs,
+        convert_params: dict[str, Any],
+        hedge_client: AsyncElevenLabs | None = None,
+        hedge_params: dict[str, Any] | None = None,
+        delay: float | None = None,
+    ) -> tuple[bytes, AsyncIterator[bytes], bool]:
+        """Open an audio stream and wait for its first chunk.
+
+        When a delay is given and the first chunk has not arrived in time, an
+        identical request is sent through the hedge client with the hedge
+        parameters. The first request to produce audio wins and the other is
+        cancelled immediately.
+
+        Returns the first chunk, the generator for the rest of the stream and
+        whether the hedge request won.
+        """
+        start = time.monotonic()
+        primary_gen = client.text_to_speech.convert(**convert_params)
+
+        if delay is None:
+            try:
+                first_chunk = await _async_first_chunk(primary_gen)
+            except BaseException:
+                await async_close_stream(primary_gen)
+                raise
+            self._ttfb.append(time.monotonic() - start)
+            return first_chunk, primary_gen, False
+
+        self.stats.hedged_requests += 1
+        primary = asyncio.create_task(_async_first_chunk(primary_gen))
+        attempts: dict[asyncio.Task[bytes], AsyncIterator[bytes]] = {primary: primary_gen}
+        started = {primary: start}
+        winner: asyncio.Task[bytes] | None = None
+
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if not done:
+                params = {**convert_params, **(hedge_params or {})}
+                _LOGGER.debug(
+                    "No audio after %.0f ms, firing hedge request with model %s",
+                    delay * 1000,
+                    params.get("model_id"),
+                )
+                self.stats.fired += 1
+                self.stats.extra_characters += len(params.get("text", ""))
+                hedge_gen = (hedge_client or client).text_to_speech.convert(**params)
+                backup = asyncio.create_task(_async_first_chunk(hedge_gen))
+                attempts[backup] = hedge_gen
+                started[backup] = time.monotonic()
+
+            pending = set(attempts)
+            error: BaseException | None = None
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                    elif task.result() and winner is None:
+                        winner = task
+
+            if winner is None:
+                if error is not None:
+                    raise error
+                return b"", primary_gen, False
+
+            self._ttfb.append(time.monotonic() - started[winner])
+            hedge_won = winner is not primary
+            if hedge_won:
+                self.stats.won += 1
+            return winner.result(), attempts[winner], hedge_won
+        finally:
+            losers = [task for task in attempts if task is not winner]
+            for task in losers:
+                task.cancel()
+            if losers:
+                await asyncio.gather(*losers, return_exceptions=True)
+            for task in losers:
+                await async_close_stream(attempts[task])
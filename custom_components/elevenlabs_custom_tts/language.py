@@ -0,0 +1,64 @@
+"""Cheap local language detection for TTS messages."""
+
+from __future__ import annotations
+
+import re
+
+# Characters unique to a language within its script
+SCRIPT_RANGES = (
+    ("ja", re.compile(r"[぀-ヿ]")),  # Hiragana and Katakana
+    ("ko", re.compile(r"[가-힯]")),  # Hangul
+    ("zh", re.compile(r"[一-鿿]")),  # CJK ideographs without kana
+    ("ar", re.compile(r"[؀-ۿ]")),
+    ("el", re.compile(r"[Ͱ-Ͽ]")),
+    ("hi", re.compile(r"[ऀ-ॿ]")),
+    ("ta", re.compile(r"[஀-௿]")),
+    ("uk", re.compile(r"[іїєґІЇЄҐ]")),
+    ("ru", re.compile(r"[Ѐ-ӿ]")),
+)
+
+STOPWORDS = {
+    "en": {"the", "and", "is", "are", "you", "to", "of", "in", "it", "your", "has", "been", "was", "on", "this", "with"},
+    "de": {"der", "die", "das", "und", "ist", "nicht", "ich", "du", "ein", "eine", "wurde", "mit", "auf", "bitte"},
+    "fr": {"le", "la", "les", "et", "est", "un", "une", "vous", "je", "pas", "des", "du", "dans", "sur", "votre"},
+    "es": {"el", "la", "los", "las", "y", "es", "un", "una", "que", "por", "para", "está", "del", "con", "tu"},
+    "it": {"il", "lo", "la", "gli", "e", "è", "un", "una", "che", "per", "non", "sono", "della", "con", "di"},
+    "pt": {"o", "a", "os", "as", "e", "é", "um", "uma", "que", "não", "para", "com", "do", "da", "está"},
+    "nl": {"de", "het", "een", "en", "is", "niet", "ik", "je", "van", "dat", "op", "met", "voor", "zijn"},
+    "pl": {"i", "w", "nie", "jest", "się", "na", "to", "że", "do", "z", "jak", "są", "czy", "drzwi"},
+    "sv": {"och", "är", "att", "det", "en", "ett", "inte", "jag", "du", "på", "med", "för", "har"},
+    "da": {"og", "er", "at", "det", "en", "et", "ikke", "jeg", "du", "på", "med", "for", "har"},
+    "no": {"og", "er", "å", "det", "en", "et", "ikke", "jeg", "du", "på", "med", "for", "har"},
+    "fi": {"ja", "on", "ei", "se", "että", "olet", "oli", "ovat", "kanssa", "tämä"},
+    "tr": {"ve", "bir", "bu", "için", "değil", "çok", "ile", "ne", "var", "mı"},
+    "cs": {"a", "je", "se", "na", "že", "to", "není", "jsou", "ve", "pro"},
+    "ro": {"și", "este", "nu", "în", "un", "o", "la", "cu", "pentru", "sunt"},
+    "id": {"dan", "yang", "di", "ini", "itu", "tidak", "ada", "untuk", "dengan", "sudah"},
+    "hu": {"a", "az", "és", "hogy", "nem", "van", "egy", "ez", "meg", "kérem"},
+}
+
+WORD = re.compile(r"[^\W\d_]+")
+
+
+def detect_language(text: str) -> str | None:
+    """Guess the language of a message.
+
+    Non-Latin scripts are recognized by character ranges; Latin-script text is
+    scored against small stopword lists. Returns None when unsure.
+    """
+    for language, pattern in SCRIPT_RANGES:
+        if pattern.search(text):
+            return language
+
+    words = WORD.findall(text.lower())
+    if not words:
+        return None
+    scores = {
+        language: sum(word in stopwords for word in words)
+        for language, stopwords in STOPWORDS.items()
+    }
+    best = max(scores, key=scores.get)
+    ranked = sorted(scores.values(), reverse=True)
+    if ranked[0] == 0 or ranked[0] == ranked[1]:
+        return None
+    return best
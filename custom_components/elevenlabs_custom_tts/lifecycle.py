@@ -0,0 +1,127 @@
+"""Shared client and in-flight request lifecycle across entry reloads."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import logging
+
+from elevenlabs import AsyncElevenLabs
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.httpx_client import get_async_client
+
+from .const import DATA_CLIENT_REGISTRY
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ClientRegistry:
+    """Reference-counted ElevenLabs clients, one per API key.
+
+    All clients use Home Assistant's shared httpx client, so connections are
+    pooled across entries and survive an entry being reloaded.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the registry."""
+        self._hass = hass
+        self._clients: dict[str, AsyncElevenLabs] = {}
+        self._refs: dict[str, int] = {}
+
+    def acquire(self, api_key: str) -> AsyncElevenLabs:
+        """Return the client for an API key, creating it on first use."""
+        if api_key not in self._clients:
+            self._clients[api_key] = AsyncElevenLabs(
+                api_key=api_key,
+                httpx_client=get_async_client(self._hass),
+            )
+            self._refs[api_key] = 0
+        self._refs[api_key] += 1
+        return self._clients[api_key]
+
+    def release(self, api_key: str) -> None:
+        """Drop a reference, forgetting the client when it is no longer used."""
+        if api_key not in self._refs:
+            return
+        self._refs[api_key] -= 1
+        if self._refs[api_key] <= 0:
+            del self._refs[api_key]
+            del self._clients[api_key]
+
+
+def async_get_client_registry(hass: HomeAssistant) -> ClientRegistry:
+    """Return the client registry shared by all entries."""
+    if DATA_CLIENT_REGISTRY not in hass.data:
+        hass.data[DATA_CLIENT_REGISTRY] = ClientRegistry(hass)
+    return hass.data[DATA_CLIENT_REGISTRY]
+
+
+class RequestTracker:
+    """Count in-flight TTS requests so an unload can wait for them."""
+
+    def __init__(self) -> None:
+        """Initialize the tracker."""
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of requests being served."""
+        return self._in_flight
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """Track a request for the duration of the context."""
+        self._in_flight += 1
+        self._idle.clear()
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            if not self._in_flight:
+                self._idle.set()
+
+    async def async_drain(self, timeout: float) -> bool:
+        """Wait up to timeout seconds for in-flight requests to finish."""
+        if not self._in_flight:
+            return True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+@dataclass
+class AbortStats:
+    """Count requests abandoned by their caller and what that saved.
+
+    Characters are saved when a request is cancelled before it is sent.
+    Bytes saved are estimated from the audio size per character of
+    completed streams in the same format.
+    """
+
+    aborted: int = 0
+    characters_saved: int = 0
+    bytes_saved: int = 0
+    _characters: Counter[str] = field(default_factory=Counter, repr=False)
+    _bytes: Counter[str] = field(default_factory=Counter, repr=False)
+
+    def record_complete(self, audio_format: str, characters: int, received: int) -> None:
+        """Record a stream that was read to the end."""
+        self._characters[audio_format] += characters
+        self._bytes[audio_format] += received
+
+    def record_abort(self, audio_format: str, characters: int, received: int | None) -> None:
+        """Record a cancelled request; received is None if it was never sent."""
+        self.aborted += 1
+        if received is None:
+            self.characters_saved += characters
+        elif self._characters[audio_format]:
+            expected = characters * self._bytes[audio_format] / self._characters[audio_format]
+            self.bytes_saved += max(0, round(expected) - received)
@@ -0,0 +1,20 @@
+"""Runtime data for the ElevenLabs Custom TTS integration."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from elevenlabs import AsyncElevenLabs
+
+from .lifecycle import RequestTracker
+from .trace import Tracer
+
+
+@dataclass
+class ElevenLabsRuntimeData:
+    """Data kept in hass.data for each config entry."""
+
+    client: AsyncElevenLabs
+    api_key: str
+    tracer: Tracer = field(default_factory=Tracer)
+    requests: RequestTracker = field(default_factory=RequestTracker)
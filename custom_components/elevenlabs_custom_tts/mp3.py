@@ -0,0 +1,270 @@
+"""MPEG audio Layer III frame scanning without decoding.
+
+The scanner walks frame headers to count frames, skips ID3 tags and the
+Xing/Info/VBRI header frame, reads the LAME encoder delay and padding, and
+notices corrupt bytes and a truncated last frame. It can be fed chunk by
+chunk while a stream arrives.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import NamedTuple
+
+# Bitrates in kbit/s for Layer III, by MPEG version
+_BITRATES_V1 = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+_BITRATES_V2 = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+
+# Sample rates by version bits (0 = MPEG 2.5, 2 = MPEG 2, 3 = MPEG 1)
+_SAMPLE_RATES = {
+    0: (11025, 12000, 8000),
+    2: (22050, 24000, 16000),
+    3: (44100, 48000, 32000),
+}
+
+ID3V2_HEADER_SIZE = 10
+ID3V1_SIZE = 128
+LAME_DELAY_OFFSET = 21  # From the encoder string to the delay/padding field
+
+
+class FrameHeader(NamedTuple):
+    """A parsed MPEG audio frame header."""
+
+    version: int
+    sample_rate: int
+    channels: int
+    length: int
+    samples: int
+    side_info: int
+
+
+def parse_header(data: bytes | bytearray, offset: int) -> FrameHeader | None:
+    """Parse the Layer III frame header at offset, or return None."""
+    if offset + 4 > len(data):
+        return None
+    b0, b1, b2, b3 = data[offset:offset + 4]
+    if b0 != 0xFF or b1 & 0xE0 != 0xE0:
+        return None
+    version = (b1 >> 3) & 3
+    layer = (b1 >> 1) & 3
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 3
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 1
+    channels = 1 if b3 >> 6 == 3 else 2
+    if version == 3:
+        bitrate = _BITRATES_V1[bitrate_index] * 1000
+        length = 144 * bitrate // sample_rate + padding
+        samples = 1152
+        side_info = 17 if channels == 1 else 32
+    else:
+        bitrate = _BITRATES_V2[bitrate_index] * 1000
+        length = 72 * bitrate // sample_rate + padding
+        samples = 576
+        side_info = 9 if channels == 1 else 17
+    if not b1 & 1:
+        side_info += 2  # CRC
+    return FrameHeader(version, sample_rate, channels, length, samples, side_info)
+
+
+@dataclass
+class Mp3Info:
+    """What a scan found out about an MP3 clip."""
+
+    frames: int = 0
+    sample_rate: int = 0
+    channels: int = 0
+    samples_per_frame: int = 0
+    encoder_delay: int = 0
+    encoder_padding: int = 0
+    corrupt_bytes: int = 0
+    truncated: bool = False
+
+    @property
+    def samples(self) -> int:
+        """Return the number of samples, excluding encoder delay and padding."""
+        total = self.frames * self.samples_per_frame
+        return max(0, total - self.encoder_delay - self.encoder_padding)
+
+    @property
+    def duration(self) -> float:
+        """Return the playing time in seconds."""
+        return self.samples / self.sample_rate if self.sample_rate else 0.0
+
+    @property
+    def damaged(self) -> bool:
+        """Return True if the clip has corrupt bytes or a truncated tail."""
+        return self.truncated or bool(self.corrupt_bytes)
+
+
+def _gapless_info(frame: bytes | bytearray, header: FrameHeader) -> tuple[int, int] | None:
+    """Return the encoder delay and padding if frame is a Xing/Info/VBRI header.
+
+    Header frames without a LAME tag report zero delay and padding.
+    """
+    tag_offset = 4 + header.side_info
+    tag = bytes(frame[tag_offset:tag_offset + 4])
+    if frame[36:40] == b"VBRI":
+        return 0, 0
+    if tag not in (b"Xing", b"Info"):
+        return None
+
+    flags = int.from_bytes(frame[tag_offset + 4:tag_offset + 8], "big")
+    lame = tag_offset + 8
+    for flag, size in ((1, 4), (2, 4), (4, 100), (8, 4)):
+        if flags & flag:
+            lame += size
+    field = frame[lame + LAME_DELAY_OFFSET:lame + LAME_DELAY_OFFSET + 3]
+    if len(field) < 3 or not frame[lame:lame + 4].isalpha():
+        return 0, 0
+    return (field[0] << 4) | (field[1] >> 4), ((field[1] & 0x0F) << 8) | field[2]
+
+
+class Mp3Scanner:
+    """Scan an MP3 stream chunk by chunk.
+
+    The stream offsets of the audio frames are kept, so that audio() can cut
+    the clip down to its frames, without tags, header frame, corrupt bytes
+    or a truncated last frame.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the scanner."""
+        self.info = Mp3Info()
+        self.frames: list[tuple[int, int]] = []
+        self._buffer = bytearray()
+        self._offset = 0  # Stream offset of the start of the buffer
+        self._skip = 0
+        self._started = False
+        self._synced = False
+
+    def feed(self, chunk: bytes) -> None:
+        """Scan the next chunk of the stream."""
+        self._buffer += chunk
+        self._scan(final=False)
+
+    def finish(self) -> Mp3Info:
+        """Scan what is left of the stream and return the result."""
+        self._scan(final=True)
+        if self._skip or self._buffer:
+            if self._skip or parse_header(self._buffer, 0):
+                self.info.truncated = True
+            else:
+                self.info.corrupt_bytes += len(self._buffer)
+            self._buffer.clear()
+            self._skip = 0
+        return self.info
+
+    def audio(self, data: bytes) -> bytes:
+        """Return the audio frames of the scanned stream data."""
+        return b"".join(data[start:end] for start, end in self.frames)
+
+    def _scan(self, final: bool) -> None:
+        """Consume every complete frame or tag in the buffer."""
+        buffer = self._buffer
+        pos = 0
+        if self._skip:
+            pos = min(self._skip, len(buffer))
+            self._skip -= pos
+
+        while not self._skip and pos < len(buffer):
+            if not self._started:
+                if len(buffer) - pos < ID3V2_HEADER_SIZE and not final:
+                    break
+                self._started = True
+                if buffer[pos:pos + 3] == b"ID3" and len(buffer) - pos >= ID3V2_HEADER_SIZE:
+                    size = 0
+                    for byte in buffer[pos + 6:pos + 10]:
+                        size = (size << 7) | (byte & 0x7F)
+                    if buffer[pos + 5] & 0x10:
+                        size += ID3V2_HEADER_SIZE  # Footer
+                    pos = self._advance(buffer, pos, ID3V2_HEADER_SIZE + size)
+                    continue
+
+            header = parse_header(buffer, pos)
+            if header is None:
+                if len(buffer) - pos < 4 and not final:
+                    break
+                if buffer[pos:pos + 3] == b"TAG":
+                    pos = self._advance(buffer, pos, ID3V1_SIZE)
+                    continue
+                self.info.corrupt_bytes += 1
+                self._synced = False
+                pos += 1
+                continue
+
+            end = pos + header.length
+            if end > len(buffer):
+                break
+            # After losing sync, only trust a header followed by another
+            if not self._synced and not final and self.info.frames:
+                if end + 4 > len(buffer):
+                    break
+                if parse_header(buffer, end) is None and buffer[end:end + 3] != b"TAG":
+                    self.info.corrupt_bytes += 1
+                    pos += 1
+                    continue
+            self._synced = True
+            self._add_frame(buffer, pos, end, header)
+            pos = end
+
+        del buffer[:pos]
+        self._offset += pos
+
+    def _advance(self, buffer: bytearray, pos: int, size: int) -> int:
+        """Skip size bytes, remembering the part not yet received."""
+        available = min(size, len(buffer) - pos)
+        self._skip = size - available
+        return pos + available
+
+    def _add_frame(self, buffer: bytearray, start: int, end: int, header: FrameHeader) -> None:
+        """Count an audio frame, or read the header frame."""
+        info = self.info
+        if not info.frames and not info.sample_rate:
+            info.sample_rate = header.sample_rate
+            info.channels = header.channels
+            info.samples_per_frame = header.samples
+            if (gapless := _gapless_info(buffer[start:end], header)) is not None:
+                info.encoder_delay, info.encoder_padding = gapless
+                return
+        info.frames += 1
+        self.frames.append((self._offset + start, self._offset + end))
+
+
+def scan_mp3(data: bytes) -> Mp3Scanner:
+    """Scan a complete MP3 clip."""
+    scanner = Mp3Scanner()
+    scanner.feed(data)
+    scanner.finish()
+    return scanner
+
+
+def join_mp3(clips: list[bytes]) -> bytes | None:
+    """Join MP3 clips frame by frame for near-gapless playback.
+
+    Tags, header frames and damaged bytes are dropped, as are trailing
+    frames made up entirely of encoder padding. Returns None if the clips do
+    not share a sample rate and channel count and must be re-encoded.
+    """
+    scanned = [scan_mp3(data) for data in clips]
+    formats = {
+        (scanner.info.sample_rate, scanner.info.channels)
+        for scanner in scanned
+        if scanner.info.frames
+    }
+    if len(formats) > 1:
+        return None
+
+    parts: list[bytes] = []
+    for index, (data, scanner) in enumerate(zip(clips, scanned)):
+        frames = scanner.frames
+        info = scanner.info
+        if index < len(scanned) - 1 and info.samples_per_frame:
+            drop = min(info.encoder_padding // info.samples_per_frame, len(frames) - 1)
+            if drop > 0:
+                frames = frames[:-drop]
+        parts.extend(data[start:end] for start, end in frames)
+    return b"".join(parts)
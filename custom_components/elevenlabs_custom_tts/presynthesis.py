@@ -0,0 +1,83 @@
+"""Message history used to synthesize predictable announcements ahead of time."""
+
+from __future__ import annotations
+
+from collections import Counter
+import heapq
+import json
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    PRESYNTH_HISTORY_SIZE,
+    PRESYNTH_MAX_COUNT,
+    PRESYNTH_SAVE_DELAY,
+    PRESYNTH_STORAGE_KEY,
+    PRESYNTH_STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+Request = tuple[str, str, dict[str, Any]]
+
+
+def _request_key(message: str, language: str, options: dict[str, Any]) -> str:
+    """Return a stable key for a request."""
+    return json.dumps([message, language, options], sort_keys=True)
+
+
+class MessageHistory:
+    """Frequency histogram of synthesized requests per voice profile.
+
+    Each profile keeps its most frequent requests only; when a count gets
+    large all counts of the profile are halved, so old favourites fade.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the history."""
+        self._store: Store = Store(
+            hass, PRESYNTH_STORAGE_VERSION, f"{PRESYNTH_STORAGE_KEY}.{entry_id}"
+        )
+        self._profiles: dict[str, Counter[str]] = {}
+
+    async def async_load(self) -> None:
+        """Load the stored history."""
+        data = await self._store.async_load()
+        if data:
+            self._profiles = {
+                profile: Counter(counts) for profile, counts in data["profiles"].items()
+            }
+
+    def record(self, message: str, language: str, options: dict[str, Any]) -> None:
+        """Count a synthesized request."""
+        profile = options.get("voice_profile") or options.get("voice") or ""
+        counts = self._profiles.setdefault(profile, Counter())
+        key = _request_key(message, language, options)
+        if key not in counts and len(counts) >= PRESYNTH_HISTORY_SIZE:
+            del counts[min(counts, key=counts.__getitem__)]
+        counts[key] += 1
+        if counts[key] >= PRESYNTH_MAX_COUNT:
+            for other, count in list(counts.items()):
+                if count > 1:
+                    counts[other] = count // 2
+                else:
+                    del counts[other]
+        self._store.async_delay_save(self._data, PRESYNTH_SAVE_DELAY)
+
+    def top(self, limit: int) -> list[Request]:
+        """Return the most frequent requests over all profiles."""
+        entries = (
+            (count, key) for counts in self._profiles.values() for key, count in counts.items()
+        )
+        requests = []
+        for _, key in heapq.nlargest(limit, entries):
+            message, language, options = json.loads(key)
+            requests.append((message, language, options))
+        return requests
+
+    def _data(self) -> dict[str, Any]:
+        """Return the history for storage."""
+        return {"profiles": {profile: dict(counts) for profile, counts in self._profiles.items()}}
@@ -0,0 +1,65 @@
+"""Latency-aware model routing."""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+from .const import (
+    MODELS,
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    ROUTING_SHORT_MESSAGE_CHARS,
+    ROUTING_STREAMING_LATENCY,
+)
+from .language import detect_language
+
+
+class Route(NamedTuple):
+    """The model and language chosen for a request."""
+
+    model_id: str
+    language: str
+    reason: str
+    optimize_streaming_latency: int | None = None
+
+
+def _fastest_model(language: str) -> str | None:
+    """Return the fastest model supporting a language."""
+    candidates = [
+        (rank, model_id)
+        for model_id, (rank, languages) in MODELS.items()
+        if language in languages
+    ]
+    return min(candidates)[1] if candidates else None
+
+
+def choose_route(
+    message: str, language: str, model_id: str, priority: str | None
+) -> Route:
+    """Pick the model for a request.
+
+    Interactive and short messages go to the fastest model supporting the
+    detected language; background and long messages keep the profile's
+    model as long as it supports the language.
+    """
+    language = detect_language(message) or language.split("-")[0].lower()
+    supported = language in MODELS.get(model_id, (0, []))[1]
+
+    if priority == PRIORITY_BACKGROUND and supported:
+        return Route(model_id, language, "background")
+
+    interactive = priority == PRIORITY_INTERACTIVE
+    if interactive or len(message) <= ROUTING_SHORT_MESSAGE_CHARS:
+        fastest = _fastest_model(language) or model_id
+        if supported and MODELS[fastest][0] >= MODELS[model_id][0]:
+            fastest = model_id
+        return Route(
+            fastest,
+            language,
+            "interactive" if interactive else "short",
+            ROUTING_STREAMING_LATENCY if interactive else None,
+        )
+
+    if supported:
+        return Route(model_id, language, "profile")
+    return Route(_fastest_model(language) or model_id, language, "language")
@@ -0,0 +1,120 @@
+"""Lightweight per-request tracing for TTS requests."""
+
+from __future__ import annotations
+
+from collections import deque
+import json
+import logging
+import time
+from typing import Any
+
+from homeassistant.util.ulid import ulid_now
+
+from .const import TRACE_BUFFER_SIZE
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RequestTrace:
+    """Phase timings and metadata of a single TTS request."""
+
+    __slots__ = (
+        "request_id",
+        "started",
+        "characters",
+        "profile",
+        "model",
+        "engine",
+        "bytes",
+        "outcome",
+        "details",
+        "phases",
+        "_start",
+        "_mark",
+    )
+
+    def __init__(self, characters: int) -> None:
+        """Start a trace."""
+        self.request_id = ulid_now()
+        self.started = time.time()
+        self.characters = characters
+        self.profile: str | None = None
+        self.model: str | None = None
+        self.engine: str | None = None
+        self.bytes = 0
+        self.outcome: str | None = None
+        self.details: dict[str, Any] = {}
+        self.phases: dict[str, float] = {}
+        self._start = self._mark = time.perf_counter()
+
+    def mark(self, phase: str) -> None:
+        """Record the time spent since the previous mark as a phase."""
+        now = time.perf_counter()
+        self.phases[phase] = round((now - self._mark) * 1000, 2)
+        self._mark = now
+
+    def set(self, **fields: Any) -> None:
+        """Set trace fields; unknown fields are kept as details."""
+        for key, value in fields.items():
+            if key in self.__slots__:
+                setattr(self, key, value)
+            else:
+                self.details[key] = value
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the trace as a JSON-serializable dict."""
+        return {
+            "request_id": self.request_id,
+            "started": self.started,
+            "profile": self.profile,
+            "model": self.model,
+            "engine": self.engine,
+            "characters": self.characters,
+            "bytes": self.bytes,
+            "outcome": self.outcome,
+            "total_ms": round((self._mark - self._start) * 1000, 2),
+            "phases_ms": self.phases,
+            **self.details,
+        }
+
+
+class _NullTrace:
+    """Trace used when tracing is disabled; every call is a no-op."""
+
+    __slots__ = ()
+
+    def mark(self, phase: str) -> None:
+        """Do nothing."""
+
+    def set(self, **fields: Any) -> None:
+        """Do nothing."""
+
+
+NULL_TRACE = _NullTrace()
+
+
+class Tracer:
+    """Keep the most recent request traces in a fixed-size ring buffer."""
+
+    def __init__(self, size: int = TRACE_BUFFER_SIZE) -> None:
+        """Initialize the tracer."""
+        self._traces: deque[RequestTrace] = deque(maxlen=size)
+
+    def start(self, enabled: bool, characters: int) -> RequestTrace | _NullTrace:
+        """Start a trace, or return the no-op trace when tracing is disabled."""
+        if not enabled:
+            return NULL_TRACE
+        return RequestTrace(characters)
+
+    def finish(self, trace: RequestTrace | _NullTrace, log: bool = False) -> None:
+        """Store a finished trace and optionally log it as a structured line."""
+        if trace is NULL_TRACE:
+            return
+        trace.mark("finish")
+        self._traces.append(trace)
+        if log:
+            _LOGGER.info("TTS trace: %s", json.dumps(trace.as_dict(), default=str))
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return the buffered traces, oldest first."""
+        return [trace.as_dict() for trace in self._traces]
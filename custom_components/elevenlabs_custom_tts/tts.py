@@ -3,6 +3,10 @@
 from __future__ import annotations
 
 import asyncio
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import asdict
+from datetime import timedelta
 import logging
 from typing import Any
 
@@ -10,9 +14,19 @@ import async_timeout
 from elevenlabs import VoiceSettings
 from elevenlabs.core import ApiError
 
+from homeassistant.components.ffmpeg import get_ffmpeg_manager
 from homeassistant.components.tts import TextToSpeechEntity, TtsAudioType, Voice
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.exceptions import TemplateError
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import (
+    TrackTemplate,
+    TrackTemplateResult,
+    TrackTemplateResultInfo,
+    async_track_template_result,
+)
+from homeassistant.helpers.template import Template
 from homeassistant.config_entries import ConfigEntry
 
 from .const import (
@@ -24,11 +38,91 @@ from .const import (
     DEFAULT_SPEED,
     DEFAULT_USE_SPEAKER_BOOST,
     DEFAULT_APPLY_TEXT_NORMALIZATION,
+    ATTR_PRIORITY,
+    PRIORITY_INTERACTIVE,
+    CONF_HEDGE_MODE,
+    CONF_HEDGE_DELAY_MS,
+    CONF_HEDGE_PERCENTILE,
+    CONF_HEDGE_MODEL_ID,
+    CONF_HEDGE_API_KEY,
+    DEFAULT_HEDGE_MODE,
+    DEFAULT_HEDGE_DELAY_MS,
+    DEFAULT_HEDGE_PERCENTILE,
+    HEDGE_MODE_ALWAYS,
+    HEDGE_MODE_INTERACTIVE,
+    HEDGE_MODE_OFF,
+    CONF_FALLBACK_ENGINE,
+    CONF_FALLBACK_DEADLINE,
+    DEFAULT_FALLBACK_ENGINE,
+    DEFAULT_FALLBACK_DEADLINE,
+    ENGINE_ELEVENLABS,
+    AUDIO_FORMAT_WAV,
+    DEFAULT_AUDIO_FORMAT,
+    PCM_OUTPUT_FORMAT,
+    PCM_SAMPLE_RATE,
+    CONF_TRACE_ENABLED,
+    CONF_TRACE_LOG,
+    DEFAULT_TRACE_ENABLED,
+    DEFAULT_TRACE_LOG,
+    MAX_DIALOGUE_CONCURRENCY,
+    MODELS,
+    NO_FORCED_NORMALIZATION_MODELS,
+    CONF_MODEL_ROUTING,
+    DEFAULT_MODEL_ROUTING,
+    DEFAULT_TARGET_LUFS,
+    DEFAULT_POST_SAMPLE_RATE,
+    CONF_CACHE_BACKEND,
+    CONF_CACHE_LOCATION,
+    DEFAULT_CACHE_BACKEND,
+    DEFAULT_CACHE_LOCATION,
+    CONF_PRESYNTH_ENABLED,
+    CONF_PRESYNTH_TOP_N,
+    CONF_PRESYNTH_TEMPLATES,
+    DEFAULT_PRESYNTH_ENABLED,
+    DEFAULT_PRESYNTH_TOP_N,
+    DEFAULT_PRESYNTH_TEMPLATES,
+    PRESYNTH_IDLE_DELAY,
+    PRESYNTH_MAX_ENTRIES,
+    PRESYNTH_TEMPLATE_RATE_LIMIT,
+)
+from .audio import (
+    PostProcessSettings,
+    audio_duration,
+    join_clips,
+    pcm_to_wav,
+    post_process_audio,
 )
+from .cache import AudioCache, AudioEntry
+from .canonical import audio_cache_key, quantize_options
+from .dialogue import DialogueSegment, parse_dialogue
+from .fallback import CircuitBreaker, EngineStats, async_get_fallback_audio, is_quota_error
+from .hedging import HedgeController, async_close_stream
+from .lifecycle import AbortStats
+from .routing import choose_route
+from .models import ElevenLabsRuntimeData
+from .mp3 import Mp3Scanner
+from .presynthesis import MessageHistory
+from .trace import NULL_TRACE, RequestTrace
 
 _LOGGER = logging.getLogger(__name__)
 
-SUPPORT_LANGUAGES = ["en", "es", "fr", "de", "it", "pt", "pl", "tr", "ru", "nl", "cs", "ar", "zh", "ja", "hu", "ko"]
+# Values that are dropped from canonical cache keys
+CANONICAL_DEFAULTS = {
+    "model_id": DEFAULT_MODEL,
+    "stability": DEFAULT_STABILITY,
+    "similarity_boost": DEFAULT_SIMILARITY_BOOST,
+    "style": DEFAULT_STYLE,
+    "speed": DEFAULT_SPEED,
+    "use_speaker_boost": DEFAULT_USE_SPEAKER_BOOST,
+    "apply_text_normalization": DEFAULT_APPLY_TEXT_NORMALIZATION,
+    "audio_format": DEFAULT_AUDIO_FORMAT,
+    "trim_silence": False,
+    "target_lufs": DEFAULT_TARGET_LUFS,
+    "sample_rate": DEFAULT_POST_SAMPLE_RATE,
+    "downmix": False,
+}
+
+SUPPORT_LANGUAGES = sorted({language for _, languages in MODELS.values() for language in languages})
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -41,23 +135,52 @@ async def async_setup_entry(
         _LOGGER.error("ElevenLabs integration not loaded")
         return
         
-    client = hass.data[DOMAIN][config_entry.entry_id]
-    async_add_entities([ElevenLabsTTSProvider(hass, client, config_entry)])
+    runtime_data = hass.data[DOMAIN][config_entry.entry_id]
+    async_add_entities([ElevenLabsTTSProvider(hass, config_entry, runtime_data)])
 
 
 class ElevenLabsTTSProvider(TextToSpeechEntity):
     """ElevenLabs TTS provider."""
 
-    def __init__(self, hass: HomeAssistant, client, config_entry: ConfigEntry) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        runtime_data: ElevenLabsRuntimeData,
+    ) -> None:
         """Initialize ElevenLabs TTS provider."""
         self.hass = hass
-        self._client = client
+        self._client = runtime_data.client
         self._config_entry = config_entry
+        self._tracer = runtime_data.tracer
+        self._requests = runtime_data.requests
         # Set the entity name for entity ID generation
         self._name = "elevenlabs_custom_tts"
         # Set the friendly name that should appear in UI and registry
         self._attr_name = "ElevenLabs Custom TTS"
         self._friendly_name = "ElevenLabs Custom TTS"
+        self._hedge = HedgeController(hass)
+        self._circuit = CircuitBreaker()
+        self._engine_stats = EngineStats()
+        self._last_post_processing: dict[str, float] = {}
+        self._model_routes: Counter[str] = Counter()
+        self._audio_cache = AudioCache(hass, on_evict=self._cache_evicted)
+        self._aborts = AbortStats()
+        self._last_audio_duration: float | None = None
+        self._history = MessageHistory(hass, config_entry.entry_id)
+        self._presynthesized = 0
+        self._warming = 0
+        self._warm_tasks: set[asyncio.Task] = set()
+        self._template_tracker: TrackTemplateResultInfo | None = None
+        self._template_profiles: dict[Template, str | None] = {}
+        self._warm_debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=PRESYNTH_IDLE_DELAY,
+            immediate=False,
+            function=self._async_warm_top,
+            background=True,
+        )
 
     @property
     def name(self) -> str:
@@ -69,6 +192,45 @@ class ElevenLabsTTSProvider(TextToSpeechEntity):
         """Return a unique ID for this TTS entity."""
         return f"{DOMAIN}_tts"
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return engine and hedging counters."""
+        stats = self._hedge.stats
+        return {
+            "last_engine": self._engine_stats.last_engine,
+            "last_fallback_reason": self._engine_stats.last_fallback_reason,
+            "served_by": dict(self._engine_stats.served),
+            "circuit_open": self._circuit.is_open,
+            "last_post_processing_ms": self._last_post_processing,
+            "last_audio_duration": self._last_audio_duration,
+            "model_routes": dict(self._model_routes),
+            "audio_cache_hits": self._audio_cache.hits,
+            "audio_cache_misses": self._audio_cache.misses,
+            "aborted_requests": self._aborts.aborted,
+            "abort_characters_saved": self._aborts.characters_saved,
+            "abort_bytes_saved": self._aborts.bytes_saved,
+            "presynthesized": self._presynthesized,
+            "hedged_requests": stats.hedged_requests,
+            "hedges_fired": stats.fired,
+            "hedges_won": stats.won,
+            "hedge_extra_characters": stats.extra_characters,
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Load the message history and start pre-synthesis."""
+        await super().async_added_to_hass()
+        await self._history.async_load()
+        self.async_on_remove(
+            self._config_entry.add_update_listener(self._async_options_updated)
+        )
+        self.async_on_remove(self._warm_debouncer.async_cancel)
+        self.async_on_remove(self._async_untrack_templates)
+        self.async_on_remove(self._hedge.release)
+        self.async_on_remove(self._async_cancel_warm_tasks)
+        self._async_track_templates()
+        # The audio cache starts empty
+        self._warm_debouncer.async_schedule_call()
+
     @property
     def default_language(self) -> str:
         """Return the default language."""
@@ -91,7 +253,8 @@ class ElevenLabsTTSProvider(TextToSpeechEntity):
             "style",
             "speed",
             "use_speaker_boost",
-            "apply_text_normalization"
+            "apply_text_normalization",
+            "priority",
         ]
 
     @property
@@ -145,15 +308,122 @@ class ElevenLabsTTSProvider(TextToSpeechEntity):
         self, message: str, language: str, options: dict[str, Any] | None = None
     ) -> TtsAudioType:
         """Load TTS audio file from ElevenLabs."""
-        _LOGGER.debug("TTS request received for message length: %d", len(message))
-        _LOGGER.debug("Language: %s", language) 
-        _LOGGER.debug("Options: %s", options)
+        # Options are replaced as a whole when edited, so holding on to the
+        # current mapping gives the request a consistent configuration
+        settings = self._config_entry.options
+        trace = self._tracer.start(
+            settings.get(CONF_TRACE_ENABLED, DEFAULT_TRACE_ENABLED), len(message)
+        )
+        try:
+            with self._requests.track():
+                if segments := parse_dialogue(message):
+                    result = await self._async_get_dialogue_audio(
+                        segments, language, options or {}, settings, trace
+                    )
+                else:
+                    result = await self._async_get_tts_audio(
+                        message, language, options or {}, settings, trace
+                    )
+                if result and result.data:
+                    self._record_duration(result, trace)
+                    if settings.get(CONF_PRESYNTH_ENABLED, DEFAULT_PRESYNTH_ENABLED):
+                        self._history.record(message, language, options or {})
+        except asyncio.CancelledError:
+            trace.set(outcome="cancelled")
+            raise
+        finally:
+            self._tracer.finish(trace, settings.get(CONF_TRACE_LOG, DEFAULT_TRACE_LOG))
+        if result is None:
+            return None
+        return (result.extension, result.data)
+
+    async def _async_get_dialogue_audio(
+        self,
+        segments: list[DialogueSegment],
+        language: str,
+        options: dict[str, Any],
+        settings: Mapping[str, Any],
+        trace: RequestTrace,
+    ) -> AudioEntry | None:
+        """Synthesize dialogue segments concurrently and join them in order."""
+        semaphore = asyncio.Semaphore(MAX_DIALOGUE_CONCURRENCY)
         
-        if options is None:
-            options = {}
+        async def _async_segment(segment: DialogueSegment) -> AudioEntry | None:
+            segment_options = options
+            if segment.profile:
+                segment_options = {**options, "voice_profile": segment.profile}
+            try:
+                await semaphore.acquire()
+            except asyncio.CancelledError:
+                # Still queued, so the segment was never sent
+                self._aborts.record_abort(
+                    options.get("audio_format", DEFAULT_AUDIO_FORMAT), len(segment.text), None
+                )
+                raise
+            try:
+                return await self._async_get_tts_audio(
+                    segment.text, language, segment_options, settings, NULL_TRACE
+                )
+            finally:
+                semaphore.release()
+        
+        results = await asyncio.gather(*(_async_segment(segment) for segment in segments))
+        trace.mark("dialogue_segments")
+        
+        clips = []
+        for segment, result in zip(segments, results):
+            if not result or not result.data:
+                _LOGGER.warning(
+                    "Skipping dialogue segment for profile '%s', no audio generated",
+                    segment.profile,
+                )
+                continue
+            clips.append(result)
+        if not clips:
+            return None
+        if len(clips) == 1:
+            return clips[0]
+        
+        try:
+            extension, data = await self.hass.async_add_executor_job(
+                join_clips,
+                [(clip.extension, clip.data) for clip in clips],
+                get_ffmpeg_manager(self.hass).binary,
+            )
+        except Exception as err:
+            _LOGGER.error("Error joining dialogue segments: %s", err)
+            return None
+        duration = await self._async_duration(extension, data)
+        
+        trace.mark("dialogue_join")
+        trace.set(
+            profile=",".join(segment.profile or "" for segment in segments),
+            bytes=len(data),
+            outcome="ok",
+            segments=len(segments),
+        )
+        return AudioEntry(extension, data, duration)
+
+    async def _async_get_tts_audio(
+        self,
+        message: str,
+        language: str,
+        options: dict[str, Any],
+        settings: Mapping[str, Any],
+        trace: RequestTrace,
+        warming: bool = False,
+    ) -> AudioEntry | None:
+        """Resolve the request options and synthesize the message.
+
+        Pre-synthesis sets warming, which keeps the request out of the cache,
+        engine and route statistics and away from the circuit breaker.
+        """
+        _LOGGER.debug(
+            "TTS request received for message length %d, language %s", len(message), language
+        )
         
         # Get voice profiles from config entry
-        voice_profiles = self._config_entry.options.get("voice_profiles", {})
+        voice_profiles = settings.get("voice_profiles", {})
         
         # Check if voice_profile is explicitly provided
         voice_profile_name = options.get("voice_profile")
@@ -169,12 +439,11 @@ class ElevenLabsTTSProvider(TextToSpeechEntity):
         _LOGGER.debug("Voice profile requested: %s", voice_profile_name)
         
         if voice_profile_name:
-            _LOGGER.debug("Available voice profiles: %s", list(voice_profiles.keys()))
             if voice_profile_name in voice_profiles:
                 # Use voice profile settings directly - these are the user's intended settings
-                profile_options = voice_profiles[voice_profile_name].copy()
+                profile_options = voice_profiles[voice_profile_name]
                 merged_options = {**self.default_options, **profile_options}
-                _LOGGER.debug("Using voice profile '%s' with settings: %s", voice_profile_name, profile_options)
+                _LOGGER.debug("Using voice profile '%s'", voice_profile_name)
             else:
                 _LOGGER.warning("Voice profile '%s' not found in profiles %s, using default options", 
                               voice_profile_name, list(voice_profiles.keys()))
@@ -184,6 +453,11 @@ class ElevenLabsTTSProvider(TextToSpeechEntity):
             merged_options = {**self.default_options, **options}
             _LOGGER.debug("No voice profile specified, using merged options")
         
+        # Quantize float settings so near-identical requests produce identical audio
+        merged_options = quantize_options(merged_options)
+        trace.set(profile=voice_profile_name, model=merged_options["model_id"])
+        trace.mark("resolve")
+        
         voice_id = merged_options["voice"]
         model_id = merged_options["model_id"]
         stability = merged_options["stability"]
@@ -192,6 +466,50 @@ class ElevenLabsTTSProvider(TextToSpeechEntity):
         speed = merged_options["speed"]
         use_speaker_boost = merged_options["use_speaker_boost"]
         apply_text_normalization = merged_options["apply_text_normalization"]
+        optimize_streaming_latency = None
+        
+        if settings.get(CONF_MODEL_ROUTING, DEFAULT_MODEL_ROUTING):
+            route = choose_route(message, language, model_id, options.get(ATTR_PRIORITY))
+            model_id = route.model_id
+            language = route.language
+            optimize_streaming_latency = route.optimize_streaming_latency
+            if model_id in NO_FORCED_NORMALIZATION_MODELS and apply_text_normalization == "on":
+                apply_text_normalization = "auto"
+            if not warming:
+                self._model_routes[model_id] += 1
+            trace.set(model=model_id, route=route.reason, language=language)
+            trace.mark("route")
+        
+        # Key the audio on the effective request, so profile aliases, explicit
+        # defaults and float noise all share one cache entry
+        audio_format = merged_options.get("audio_format", DEFAULT_AUDIO_FORMAT)
+        post_process_settings = PostProcessSettings.from_options(merged_options)
+        cache_key = audio_cache_key(
+            message,
+            language,
+            {
+                **merged_options,
+                "model_id": model_id,
+                "apply_text_normalization": apply_text_normalization,
+                "optimize_streaming_latency": optimize_streaming_latency,
+                "audio_format": audio_format,
+                **asdict(post_process_settings),
+                # Only affect how a request is served, not its audio
+                "voice_profile": None,
+                "priority": None,
+                "fallback_voice": None,
+            },
+            CANONICAL_DEFAULTS,
+        )
+        self._audio_cache.configure(
+            settings.get(CONF_CACHE_BACKEND, DEFAULT_CACHE_BACKEND),
+            settings.get(CONF_CACHE_LOCATION, DEFAULT_CACHE_LOCATION),
+        )
+        if (cached := await self._audio_cache.async_get(cache_key, record=not warming)) is not None:
+            _LOGGER.debug("Serving TTS request from audio cache")
+            trace.set(engine="cache", bytes=len(cached.data), outcome="ok")
+            trace.mark("cache")
+            return cached
         
         voice_settings = VoiceSettings(
             stability=stability,
@@ -201,8 +519,28 @@ class ElevenLabsTTSProvider(TextToSpeechEntity):
             speed=speed,
         )
         
+        # Pre-synthesis only runs while the circuit is closed and never
+        # changes its state for real requests
+        if warming and not self._circuit.is_closed:
+            return None
+        circuit = CircuitBreaker() if warming else self._circuit
+        if not circuit.allow_request():
+            _LOGGER.warning("ElevenLabs circuit is open, skipping API request")
+            return await self._async_fallback_audio(
+                message, language, merged_options, settings, "circuit_open", trace
+            )
+        
+        # A configured fallback engine gets its own (shorter) deadline for
+        # the first audio chunk; streaming the rest keeps the full timeout
+        deadline = first_byte_deadline = 30
+        fallback_deadline = settings.get(CONF_FALLBACK_DEADLINE, DEFAULT_FALLBACK_DEADLINE)
+        if settings.get(CONF_FALLBACK_ENGINE) and fallback_deadline:
+            first_byte_deadline = min(fallback_deadline, deadline)
+        
+        # Bytes received so far, None until the request is sent
+        received: int | None = None
         try:
-            with async_timeout.timeout(30):
+            with async_timeout.timeout(deadline):
                 # Prepare conversion parameters
                 convert_params = {
                     "text": message,
@@ -212,34 +550,402 @@ class ElevenLabsTTSProvider(TextToSpeechEntity):
                     "language_code": language,
                     "apply_text_normalization": apply_text_normalization,
                 }
+                if optimize_streaming_latency is not None:
+                    convert_params["optimize_streaming_latency"] = optimize_streaming_latency
+                if audio_format == AUDIO_FORMAT_WAV:
+                    convert_params["output_format"] = PCM_OUTPUT_FORMAT
                 
-                # Generate audio with ElevenLabs (async generator)
-                audio_generator = self._client.text_to_speech.convert(**convert_params)
-                
-                # Collect all audio bytes from async generator
-                audio_bytes = b""
-                async for chunk in audio_generator:
-                    audio_bytes += chunk
-                
-                if not audio_bytes:
-                    _LOGGER.error("No audio data received from ElevenLabs")
-                    return None
-                    
-                _LOGGER.info(
-                    "Successfully generated %d bytes of audio for voice %s%s",
-                    len(audio_bytes),
-                    voice_id,
-                    f" using profile '{voice_profile_name}'" if voice_profile_name else ""
+                # Generate audio with ElevenLabs (async generator), hedging
+                # the request if the first chunk is slow to arrive
+                hedge_client, hedge_params, hedge_delay = self._hedge_settings(options, settings)
+                received = 0
+                with async_timeout.timeout(first_byte_deadline):
+                    first_chunk, audio_generator, hedge_won = await self._hedge.async_open(
+                        self._client,
+                        convert_params,
+                        hedge_client=hedge_client,
+                        hedge_params=hedge_params,
+                        delay=hedge_delay,
+                    )
+                trace.mark("first_byte")
+                # Audio from a hedge on another model or account does not
+                # match the cache key, which is built from the primary request
+                cacheable = not hedge_won or (
+                    hedge_params.get("model_id", model_id) == model_id
+                    and hedge_client in (None, self._client)
                 )
+                if hedge_won:
+                    _LOGGER.debug("Hedge request produced audio first")
+                    trace.set(hedge_won=True)
                 
-                return ("mp3", audio_bytes)
+                # Collect the remaining audio bytes from async generator,
+                # closing the stream at once if the caller goes away. MP3
+                # frames are checked as they arrive.
+                scanner = Mp3Scanner() if audio_format != AUDIO_FORMAT_WAV else None
+                audio_bytes = first_chunk
+                received = len(audio_bytes)
+                try:
+                    if scanner:
+                        scanner.feed(first_chunk)
+                    async for chunk in audio_generator:
+                        audio_bytes += chunk
+                        received += len(chunk)
+                        if scanner:
+                            scanner.feed(chunk)
+                finally:
+                    await async_close_stream(audio_generator)
+                trace.mark("stream")
+                # The scan already timed the MP3 frames; PCM is 16-bit mono
+                mp3_info = scanner.finish() if scanner else None
+                if mp3_info:
+                    duration = mp3_info.duration
+                else:
+                    duration = len(audio_bytes) / (2 * PCM_SAMPLE_RATE)
+                if mp3_info and mp3_info.damaged:
+                    _LOGGER.warning(
+                        "Dropping damaged MP3 data from ElevenLabs "
+                        "(%d corrupt bytes, truncated: %s)",
+                        mp3_info.corrupt_bytes,
+                        mp3_info.truncated,
+                    )
+                    trace.set(corrupt_bytes=mp3_info.corrupt_bytes, truncated=mp3_info.truncated)
+                    audio_bytes = scanner.audio(audio_bytes)
+                    # A glitch on this connection must not be replayed from the cache
+                    cacheable = False
+                self._aborts.record_complete(audio_format, len(message), received)
                 
+        except asyncio.CancelledError:
+            _LOGGER.debug("TTS request cancelled after %s bytes", received)
+            self._aborts.record_abort(audio_format, len(message), received)
+            circuit.record_cancelled()
+            raise
         except asyncio.TimeoutError:
-            _LOGGER.error("Timeout generating TTS audio")
-            return None
+            _LOGGER.error(
+                "Timeout generating TTS audio after %s seconds",
+                deadline if received else first_byte_deadline,
+            )
+            circuit.record_failure()
+            return await self._async_fallback_audio(message, language, merged_options, settings, "timeout", trace)
         except ApiError as err:
             _LOGGER.error("ElevenLabs API error: %s", err)
-            return None
+            quota_exhausted = is_quota_error(err)
+            circuit.record_failure(quota_exhausted)
+            return await self._async_fallback_audio(
+                message, language, merged_options, settings,
+                "quota_exhausted" if quota_exhausted else "api_error", trace,
+            )
         except Exception as err:
             _LOGGER.error("Error generating TTS audio: %s", err)
-            return None
\ No newline at end of file
+            circuit.record_failure()
+            return await self._async_fallback_audio(message, language, merged_options, settings, "error", trace)
+        
+        if not audio_bytes:
+            _LOGGER.error("No audio data received from ElevenLabs")
+            circuit.record_failure()
+            return await self._async_fallback_audio(message, language, merged_options, settings, "no_audio", trace)
+        
+        circuit.record_success()
+        if not warming:
+            self._record_engine(ENGINE_ELEVENLABS)
+        trace.set(engine=ENGINE_ELEVENLABS, bytes=len(audio_bytes), outcome="ok")
+        _LOGGER.info(
+            "Successfully generated %d bytes of audio for voice %s%s",
+            len(audio_bytes),
+            voice_id,
+            f" using profile '{voice_profile_name}'" if voice_profile_name else ""
+        )
+        
+        if audio_format == AUDIO_FORMAT_WAV:
+            result = await self._async_post_process(
+                merged_options, "wav", pcm_to_wav(audio_bytes, PCM_SAMPLE_RATE), duration, trace
+            )
+        else:
+            result = await self._async_post_process(
+                merged_options, "mp3", audio_bytes, duration, trace
+            )
+        if result and result.data and cacheable:
+            await self._audio_cache.async_set(cache_key, result)
+            if warming:
+                self._presynthesized += 1
+        return result
+
+    async def _async_fallback_audio(
+        self,
+        message: str,
+        language: str,
+        merged_options: dict[str, Any],
+        settings: Mapping[str, Any],
+        reason: str,
+        trace: RequestTrace,
+    ) -> AudioEntry | None:
+        """Serve a request with the configured fallback engine, if any."""
+        trace.set(outcome=reason)
+        engine = settings.get(CONF_FALLBACK_ENGINE, DEFAULT_FALLBACK_ENGINE)
+        if not engine or engine == self.entity_id:
+            return None
+        
+        _LOGGER.warning("Serving TTS request with fallback engine %s (%s)", engine, reason)
+        try:
+            extension, data = await async_get_fallback_audio(
+                self.hass, engine, message, language, merged_options.get("fallback_voice")
+            )
+        except Exception as err:
+            _LOGGER.error("Fallback engine %s failed: %s", engine, err)
+            return None
+        trace.mark("fallback")
+        
+        if not data:
+            _LOGGER.error("No audio data received from fallback engine %s", engine)
+            return None
+        
+        self._record_engine(engine, reason)
+        trace.set(engine=engine, bytes=len(data))
+        return await self._async_post_process(merged_options, extension, data, None, trace)
+
+    async def _async_options_updated(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Pre-synthesize again once profile edits have changed the audio."""
+        self._async_track_templates()
+        self._warm_debouncer.async_schedule_call()
+
+    @callback
+    def _cache_evicted(self, key: str) -> None:
+        """Pre-synthesize again when frequent audio may have been evicted.
+
+        Evictions caused by pre-synthesis itself do not count, or warming
+        could keep evicting and re-synthesizing its own audio.
+        """
+        if self._warming:
+            return
+        if self._config_entry.options.get(CONF_PRESYNTH_ENABLED, DEFAULT_PRESYNTH_ENABLED):
+            self._warm_debouncer.async_schedule_call()
+
+    async def _async_warm_top(self) -> None:
+        """Pre-synthesize the most frequent requests while the entity is idle.
+
+        A pass fills at most half the audio cache, counting every dialogue
+        segment as an entry of its own.
+        """
+        settings = self._config_entry.options
+        if not settings.get(CONF_PRESYNTH_ENABLED, DEFAULT_PRESYNTH_ENABLED):
+            return
+        budget = PRESYNTH_MAX_ENTRIES
+        for message, language, options in self._history.top(
+            settings.get(CONF_PRESYNTH_TOP_N, DEFAULT_PRESYNTH_TOP_N)
+        ):
+            requests = self._warm_requests(message, options)
+            if len(requests) > budget:
+                break
+            budget -= len(requests)
+            if not await self._requests.async_drain(PRESYNTH_IDLE_DELAY):
+                # Still busy, try again later
+                self._warm_debouncer.async_schedule_call()
+                return
+            await self._async_warm(message, language, options)
+
+    @staticmethod
+    def _warm_requests(message: str, options: dict[str, Any]) -> list[tuple[str, dict[str, Any]]]:
+        """Return the cache entries a message is synthesized into.
+
+        Dialogue segments are cached one by one; joining them is left to the
+        actual request.
+        """
+        if segments := parse_dialogue(message):
+            return [
+                (
+                    segment.text,
+                    {**options, "voice_profile": segment.profile} if segment.profile else options,
+                )
+                for segment in segments
+            ]
+        return [(message, options)]
+
+    async def _async_warm(self, message: str, language: str, options: dict[str, Any]) -> None:
+        """Synthesize a request into the audio cache ahead of time."""
+        # Pre-synthesis never hedges or falls back to another engine
+        settings = {
+            **self._config_entry.options,
+            CONF_HEDGE_MODE: HEDGE_MODE_OFF,
+            CONF_FALLBACK_ENGINE: "",
+        }
+        self._warming += 1
+        try:
+            with self._requests.track():
+                for text, request_options in self._warm_requests(message, options):
+                    try:
+                        await self._async_get_tts_audio(
+                            text, language, request_options, settings, NULL_TRACE, warming=True
+                        )
+                    except Exception as err:
+                        _LOGGER.debug("Error pre-synthesizing message: %s", err)
+        finally:
+            self._warming -= 1
+
+    @callback
+    def _async_track_templates(self) -> None:
+        """Pre-synthesize the configured templates whenever their result changes.
+
+        A line may start with a voice profile name and a colon, as in
+        "Butler: {{ ... }}", to synthesize with that profile.
+        """
+        self._async_untrack_templates()
+        settings = self._config_entry.options
+        if not settings.get(CONF_PRESYNTH_ENABLED, DEFAULT_PRESYNTH_ENABLED):
+            return
+        voice_profiles = settings.get("voice_profiles", {})
+        for line in settings.get(CONF_PRESYNTH_TEMPLATES, DEFAULT_PRESYNTH_TEMPLATES).splitlines():
+            profile, separator, text = line.partition(":")
+            if separator and profile.strip() in voice_profiles:
+                self._template_profiles[Template(text.strip(), self.hass)] = profile.strip()
+            elif line.strip():
+                self._template_profiles[Template(line.strip(), self.hass)] = None
+        if not self._template_profiles:
+            return
+        
+        self._template_tracker = async_track_template_result(
+            self.hass,
+            [
+                TrackTemplate(
+                    template, None, timedelta(seconds=PRESYNTH_TEMPLATE_RATE_LIMIT)
+                )
+                for template in self._template_profiles
+            ],
+            self._async_template_changed,
+        )
+        # The tracker only reports changes, so warm the current results too
+        for template in self._template_profiles:
+            try:
+                result = template.async_render(parse_result=False)
+            except TemplateError as err:
+                _LOGGER.warning("Error rendering pre-synthesis template: %s", err)
+                continue
+            self._async_warm_template(template, result)
+
+    @callback
+    def _async_untrack_templates(self) -> None:
+        """Stop tracking the pre-synthesis templates."""
+        if self._template_tracker is not None:
+            self._template_tracker.async_remove()
+            self._template_tracker = None
+        self._template_profiles = {}
+
+    @callback
+    def _async_template_changed(
+        self, event: Event | None, updates: list[TrackTemplateResult]
+    ) -> None:
+        """Pre-synthesize the new result of a tracked template."""
+        for update in updates:
+            if isinstance(update.result, TemplateError):
+                _LOGGER.warning("Error rendering pre-synthesis template: %s", update.result)
+                continue
+            self._async_warm_template(update.template, update.result)
+
+    @callback
+    def _async_warm_template(self, template: Template, result: Any) -> None:
+        """Pre-synthesize a template result with the template's voice profile."""
+        if not (message := str(result).strip()):
+            return
+        options = {}
+        if profile := self._template_profiles.get(template):
+            options["voice_profile"] = profile
+        task = self.hass.async_create_background_task(
+            self._async_warm(message, self.default_language, options),
+            f"{DOMAIN} pre-synthesis",
+        )
+        self._warm_tasks.add(task)
+        task.add_done_callback(self._warm_tasks.discard)
+
+    @callback
+    def _async_cancel_warm_tasks(self) -> None:
+        """Cancel template pre-synthesis still running when the entity goes away."""
+        for task in self._warm_tasks:
+            task.cancel()
+        self._warm_tasks.clear()
+
+    @callback
+    def _record_duration(self, result: AudioEntry, trace: RequestTrace) -> None:
+        """Publish the playing time of a result for automations waiting on it."""
+        if result.duration is None:
+            return
+        self._last_audio_duration = round(result.duration, 3)
+        trace.set(duration=self._last_audio_duration)
+        self.async_write_ha_state()
+
+    async def _async_duration(self, extension: str | None, data: bytes) -> float | None:
+        """Measure the playing time of a clip in the executor."""
+        try:
+            return await self.hass.async_add_executor_job(audio_duration, extension, data)
+        except ValueError as err:
+            _LOGGER.debug("Could not determine audio duration: %s", err)
+            return None
+
+    async def _async_post_process(
+        self,
+        merged_options: dict[str, Any],
+        extension: str | None,
+        data: bytes,
+        duration: float | None,
+        trace: RequestTrace,
+    ) -> AudioEntry:
+        """Run the profile's post-processing in the executor.
+        
+        The processed clip is what gets returned to Home Assistant, so its TTS
+        cache stores the processed audio and never runs this step twice. A
+        duration that is not known yet is measured on the final clip.
+        """
+        settings = PostProcessSettings.from_options(merged_options)
+        if not settings.enabled or extension not in ("mp3", "wav"):
+            if duration is None:
+                duration = await self._async_duration(extension, data)
+            return AudioEntry(extension, data, duration)
+        
+        try:
+            extension, data, duration, timings = await self.hass.async_add_executor_job(
+                post_process_audio,
+                extension,
+                data,
+                settings,
+                get_ffmpeg_manager(self.hass).binary,
+            )
+        except Exception as err:
+            _LOGGER.error("Audio post-processing failed, using unprocessed audio: %s", err)
+            if duration is None:
+                duration = await self._async_duration(extension, data)
+            return AudioEntry(extension, data, duration)
+        
+        self._last_post_processing = timings
+        _LOGGER.debug("Audio post-processing timings (ms): %s", timings)
+        trace.mark("post_process")
+        trace.set(bytes=len(data), post_processing_ms=timings)
+        return AudioEntry(extension, data, duration)
+
+    def _record_engine(self, engine: str, reason: str | None = None) -> None:
+        """Record which engine served a request and refresh the entity state."""
+        self._engine_stats.record(engine, reason)
+        self.async_write_ha_state()
+
+    def _hedge_settings(
+        self, options: dict[str, Any], settings: Mapping[str, Any]
+    ) -> tuple[Any, dict[str, Any], float | None]:
+        """Return the hedge client, parameter overrides and delay for a request.
+
+        The delay is None when the request should not be hedged.
+        """
+        hedge_mode = settings.get(CONF_HEDGE_MODE, DEFAULT_HEDGE_MODE)
+        interactive = options.get(ATTR_PRIORITY) == PRIORITY_INTERACTIVE
+        if not (
+            hedge_mode == HEDGE_MODE_ALWAYS
+            or (hedge_mode == HEDGE_MODE_INTERACTIVE and interactive)
+        ):
+            # Give back any client held for a hedge key that is no longer used
+            self._hedge.release()
+            return None, {}, None
+
+        hedge_params = {}
+        if hedge_model_id := settings.get(CONF_HEDGE_MODEL_ID):
+            hedge_params["model_id"] = hedge_model_id
+        hedge_client = self._hedge.client_for(settings.get(CONF_HEDGE_API_KEY), self._client)
+        hedge_delay = self._hedge.hedge_delay(
+            settings.get(CONF_HEDGE_DELAY_MS, DEFAULT_HEDGE_DELAY_MS),
+            settings.get(CONF_HEDGE_PERCENTILE, DEFAULT_HEDGE_PERCENTILE),
+        )
+        return hedge_client, hedge_params, hedge_delay
@@ -0,0 +1,51 @@
+"""Lean parsing of the ElevenLabs voice list.
+
+The SDK builds a full pydantic model for every voice, including fine-tuning,
+sharing and sample metadata. The get_voices service only needs a handful of
+fields, so the raw JSON response is parsed directly instead.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.util.json import json_loads
+
+
+def parse_voices(
+    content: bytes, voice_type: str | None, search_text: str
+) -> list[dict[str, Any]]:
+    """Return the filtered voice list from a raw /v1/voices response.
+
+    This is CPU bound for large libraries and should run in the executor.
+    """
+    voices = []
+    for voice in json_loads(content).get("voices", []):
+        category = voice.get("category") or ""
+        if voice_type and category != voice_type:
+            continue
+
+        name = voice.get("name") or ""
+        description = voice.get("description")
+        labels = voice.get("labels")
+
+        if search_text:
+            searchable_text = f"{name} {category}"
+            if description:
+                searchable_text += f" {description}"
+            if labels:
+                searchable_text += " " + " ".join(f"{key} {value}" for key, value in labels.items())
+            if search_text not in searchable_text.lower():
+                continue
+
+        voice_data = {
+            "voice_id": voice.get("voice_id"),
+            "name": name,
+            "category": category,
+        }
+        if description:
+            voice_data["description"] = description
+        if labels:
+            voice_data["labels"] = labels
+        voices.append(voice_data)
+    return voices
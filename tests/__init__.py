@@ -0,0 +1 @@
+"""Tests for the ElevenLabs Custom TTS integration."""
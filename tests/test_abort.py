@@ -0,0 +1,28 @@
+"""Tests for counting what cancelled requests saved."""
+
+from __future__ import annotations
+
+from custom_components.elevenlabs_custom_tts.lifecycle import AbortStats
+
+
+def test_abort_before_request() -> None:
+    """Test a request cancelled before sending saves all its characters."""
+    stats = AbortStats()
+    stats.record_abort("mp3", 40, None)
+    assert (stats.aborted, stats.characters_saved, stats.bytes_saved) == (1, 40, 0)
+
+
+def test_abort_estimates_bytes() -> None:
+    """Test bytes saved are estimated from completed streams of the same format."""
+    stats = AbortStats()
+    stats.record_abort("mp3", 10, 0)
+    assert stats.bytes_saved == 0  # Nothing to estimate from yet
+
+    stats.record_complete("mp3", 100, 20_000)
+    stats.record_complete("wav", 100, 480_000)
+    stats.record_abort("mp3", 50, 4_000)
+    assert stats.bytes_saved == 6_000
+
+    # A stream already longer than expected saved nothing
+    stats.record_abort("mp3", 10, 5_000)
+    assert (stats.aborted, stats.bytes_saved, stats.characters_saved) == (3, 6_000, 0)
@@ -0,0 +1,81 @@
+"""Tests for audio post-processing."""
+
+from __future__ import annotations
+
+import math
+import shutil
+import struct
+import subprocess
+
+import pytest
+
+from custom_components.elevenlabs_custom_tts.audio import (
+    PostProcessSettings,
+    audio_duration,
+    pcm_to_wav,
+    post_process_audio,
+)
+from custom_components.elevenlabs_custom_tts.mp3 import scan_mp3
+
+FFMPEG = shutil.which("ffmpeg")
+needs_ffmpeg = pytest.mark.skipif(FFMPEG is None, reason="ffmpeg is not installed")
+
+RATE = 24000
+TONE = b"".join(
+    struct.pack("<h", round(3000 * math.sin(2 * math.pi * 440 * index / RATE)))
+    for index in range(RATE)
+)
+# One second of silence, a one second tone and one second of silence
+CLIP = pcm_to_wav(bytes(2 * RATE) + TONE + bytes(2 * RATE), RATE)
+
+
+def test_settings_from_options() -> None:
+    """Test settings are read from the merged options."""
+    settings = PostProcessSettings.from_options({"target_lufs": "-16", "sample_rate": 16000})
+    assert settings == PostProcessSettings(target_lufs=-16.0, sample_rate=16000)
+    assert settings.enabled
+    assert not PostProcessSettings.from_options({}).enabled
+
+
+def test_wav_duration() -> None:
+    """Test the duration of a WAV clip is read from its samples."""
+    assert audio_duration("wav", CLIP) == 3.0
+    assert audio_duration("ogg", b"") is None
+
+
+def test_unsupported_format() -> None:
+    """Test only MP3 and WAV can be post-processed."""
+    with pytest.raises(ValueError):
+        post_process_audio("ogg", b"", PostProcessSettings(trim_silence=True), "ffmpeg")
+
+
+@needs_ffmpeg
+def test_wav_steps_timed() -> None:
+    """Test WAV is processed as PCM with one timing per enabled step."""
+    extension, data, duration, timings = post_process_audio(
+        "wav", CLIP, PostProcessSettings(True, -16.0, 16000, True), FFMPEG
+    )
+    assert extension == "wav"
+    # Mono input is not downmixed
+    assert list(timings) == ["decode", "trim_silence", "normalize", "resample", "encode"]
+    assert 1.0 <= duration < 1.5
+    assert audio_duration(extension, data) == pytest.approx(duration)
+
+
+@needs_ffmpeg
+def test_mp3_round_trip() -> None:
+    """Test MP3 is decoded once, processed as PCM and encoded again."""
+    mp3 = subprocess.run(
+        [FFMPEG, "-loglevel", "error", "-i", "pipe:0", "-ac", "2", "-f", "mp3", "pipe:1"],
+        input=CLIP,
+        capture_output=True,
+        check=True,
+    ).stdout
+    extension, data, duration, timings = post_process_audio(
+        "mp3", mp3, PostProcessSettings(trim_silence=True, downmix=True), FFMPEG
+    )
+    assert extension == "mp3"
+    assert list(timings) == ["decode", "trim_silence", "downmix", "encode"]
+    assert 1.0 <= duration < 1.5
+    info = scan_mp3(data).info
+    assert (info.channels, info.damaged) == (1, False)
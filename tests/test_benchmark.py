@@ -0,0 +1,131 @@
+"""Tests for voice profile benchmarking."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.elevenlabs_custom_tts.benchmark import (
+    async_load_history,
+    async_run_benchmark,
+    async_save_run,
+)
+from custom_components.elevenlabs_custom_tts.const import (
+    BENCHMARK_HISTORY_SIZE,
+    PCM_OUTPUT_FORMAT,
+)
+
+PROFILES = {
+    "Butler": {"voice": "butler", "model_id": "eleven_multilingual_v2"},
+    "Narrator": {"voice": "narrator"},
+}
+
+
+class FakeClient:
+    """Stand-in for AsyncElevenLabs producing a fixed stream per voice."""
+
+    def __init__(self, failing_voices: tuple[str, ...] = ()) -> None:
+        self.text_to_speech = self
+        self.failing_voices = failing_voices
+        self.calls: list[dict] = []
+        self.closed = 0
+
+    def convert(self, **params) -> AsyncIterator[bytes]:
+        self.calls.append(params)
+        return self._stream(params["voice_id"])
+
+    async def _stream(self, voice_id: str) -> AsyncIterator[bytes]:
+        try:
+            await asyncio.sleep(0.01)
+            yield b"x" * 100
+            if voice_id in self.failing_voices:
+                raise RuntimeError("synthesis failed")
+            yield b"x" * 300
+        finally:
+            self.closed += 1
+
+
+async def test_profile_models() -> None:
+    """Test each profile is measured with its own model by default."""
+    client = FakeClient()
+    results = await async_run_benchmark(client, PROFILES, None, ["Hello", "Goodbye"], 2, 2)
+    assert [(result["profile"], result["model"], result["runs"]) for result in results] == [
+        ("Butler", "eleven_multilingual_v2", 4),
+        ("Narrator", "eleven_multilingual_v2", 4),
+    ]
+    assert len(client.calls) == 8
+    result = results[0]
+    assert result["errors"] == 0
+    assert 0 < result["ttfb_ms"] <= result["total_ms"]
+    # 400 bytes and 6 characters on average per run
+    assert result["audio_bytes_per_second"] / result["characters_per_second"] == (
+        pytest.approx(400 / 6, rel=0.01)
+    )
+
+
+async def test_models_and_errors() -> None:
+    """Test every profile runs with every model and failures are counted."""
+    client = FakeClient(failing_voices=("narrator",))
+    results = await async_run_benchmark(
+        client, PROFILES, ["eleven_flash_v2_5", "eleven_turbo_v2_5"], ["Hello"], 1, 4
+    )
+    assert len(results) == 4
+    narrator = [result for result in results if result["profile"] == "Narrator"]
+    assert all(
+        result == {"profile": "Narrator", "model": result["model"], "runs": 0, "errors": 1}
+        for result in narrator
+    )
+    assert {call["model_id"] for call in client.calls} == {
+        "eleven_flash_v2_5", "eleven_turbo_v2_5"
+    }
+    # Every stream is closed, including those failing halfway
+    assert client.closed == 4
+
+
+async def test_profile_audio_format() -> None:
+    """Test WAV profiles are measured on raw PCM like real requests."""
+    client = FakeClient()
+    await async_run_benchmark(
+        client,
+        {**PROFILES, "Raw": {"voice": "raw", "audio_format": "wav"}},
+        None,
+        ["Hello"],
+        1,
+        1,
+    )
+    assert {call["voice_id"]: call.get("output_format") for call in client.calls} == {
+        "butler": None, "narrator": None, "raw": PCM_OUTPUT_FORMAT
+    }
+
+
+async def test_forced_normalization_downgraded() -> None:
+    """Test models that reject forced normalization are asked for auto."""
+    client = FakeClient()
+    await async_run_benchmark(
+        client,
+        {"Butler": {"voice": "butler", "apply_text_normalization": "on"}},
+        ["eleven_flash_v2_5", "eleven_multilingual_v2"],
+        ["Hello"],
+        1,
+        1,
+    )
+    assert {
+        call["model_id"]: call["apply_text_normalization"] for call in client.calls
+    } == {"eleven_flash_v2_5": "auto", "eleven_multilingual_v2": "on"}
+
+
+async def test_history(hass: HomeAssistant) -> None:
+    """Test concurrent runs are all saved and the history is capped."""
+    await asyncio.gather(*(async_save_run(hass, [{"run": index}]) for index in range(5)))
+    history = await async_load_history(hass)
+    assert sorted(run["results"][0]["run"] for run in history) == list(range(5))
+
+    for index in range(BENCHMARK_HISTORY_SIZE):
+        await async_save_run(hass, [{"run": 5 + index}])
+    history = await async_load_history(hass)
+    assert len(history) == BENCHMARK_HISTORY_SIZE
+    assert history[-1]["results"] == [{"run": 4 + BENCHMARK_HISTORY_SIZE}]
@@ -0,0 +1,181 @@
+"""Tests for audio cache entries and the shared cache backends."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.elevenlabs_custom_tts.cache import (
+    AudioCache,
+    AudioEntry,
+    DirectoryCacheBackend,
+    HttpCacheBackend,
+    decode_entry,
+    encode_entry,
+)
+from custom_components.elevenlabs_custom_tts.const import (
+    CACHE_BACKEND_DIRECTORY,
+    CACHE_BACKEND_HTTP,
+    CACHE_KEY_VERSION,
+)
+
+HASH = "ab" + "0" * 62
+KEY = f"{CACHE_KEY_VERSION}-{HASH}"
+
+
+def test_entry_round_trip() -> None:
+    """Test entries keep their extension, audio and duration."""
+    for entry in (AudioEntry("mp3", b"\xff\xfb\n audio"), AudioEntry("wav", b"RIFF", 1.25)):
+        assert decode_entry(encode_entry(entry)) == entry
+
+
+def test_decode_malformed() -> None:
+    """Test malformed payloads are treated as missing."""
+    assert decode_entry(b"mp3") is None
+    assert decode_entry(b"mp3\n") is None
+    assert decode_entry(b"../x\naudio") is None
+    assert decode_entry(b"mp3 long\naudio") is None
+
+
+def test_directory_write_read(tmp_path: Path) -> None:
+    """Test entries are written atomically and read back."""
+    backend = DirectoryCacheBackend(None, str(tmp_path))
+    entry = AudioEntry("mp3", b"audio", 2.5)
+    backend._write(KEY, entry)
+    assert backend._read(KEY) == entry
+    # Only the final file is left behind, sharded by version and hash
+    assert [path.relative_to(tmp_path).as_posix() for path in tmp_path.rglob("*.*")] == [
+        f"{CACHE_KEY_VERSION}/ab/{KEY}.tts"
+    ]
+    assert backend._read(f"{CACHE_KEY_VERSION}-cd" + "0" * 62) is None
+
+
+def test_directory_overwrite(tmp_path: Path) -> None:
+    """Test writing an existing key replaces the file."""
+    backend = DirectoryCacheBackend(None, str(tmp_path))
+    backend._write(KEY, AudioEntry("mp3", b"old"))
+    backend._write(KEY, AudioEntry("mp3", b"new"))
+    assert backend._read(KEY).data == b"new"
+
+
+def test_directory_read_refreshes_mtime(tmp_path: Path) -> None:
+    """Test reading an entry marks it as recently used."""
+    backend = DirectoryCacheBackend(None, str(tmp_path))
+    backend._write(KEY, AudioEntry("mp3", b"audio"))
+    path = backend._path(KEY)
+    os.utime(path, (1000, 1000))
+    backend._read(KEY)
+    assert path.stat().st_mtime > 1000
+
+
+def test_directory_prune(tmp_path: Path) -> None:
+    """Test expired files, stale temporary files and excess files are pruned."""
+    backend = DirectoryCacheBackend(None, str(tmp_path), max_age=1000, max_bytes=30)
+    now = 100_000
+    for index, age in enumerate((2000, 30, 20, 10)):
+        key = f"{CACHE_KEY_VERSION}-{index:02d}" + "0" * 62
+        backend._write(key, AudioEntry("mp3", b"x" * 10))
+        os.utime(backend._path(key), (now - age, now - age))
+    stale = tmp_path / CACHE_KEY_VERSION / "00" / ".stale.tmp"
+    stale.write_bytes(b"partial")
+    os.utime(stale, (now - 5000, now - 5000))
+
+    # The expired file, the temporary file and the oldest remaining file
+    assert backend.prune(now) == 3
+    assert sorted(path.parent.name for path in tmp_path.rglob("*.*")) == ["02", "03"]
+
+
+async def test_audio_cache_shares_directory(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test audio written by one instance is read by another, sharded by hash."""
+    writer = AudioCache(hass)
+    writer.configure(CACHE_BACKEND_DIRECTORY, str(tmp_path))
+    await writer.async_set(HASH, AudioEntry("mp3", b"first", 1.0))
+    await writer.async_set("cd" + "0" * 62, AudioEntry("mp3", b"second"))
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert sorted(
+        path.parent.relative_to(tmp_path).as_posix() for path in tmp_path.rglob("*.tts")
+    ) == [f"{CACHE_KEY_VERSION}/ab", f"{CACHE_KEY_VERSION}/cd"]
+
+    reader = AudioCache(hass)
+    reader.configure(CACHE_BACKEND_DIRECTORY, str(tmp_path))
+    assert await reader.async_get(HASH) == AudioEntry("mp3", b"first", 1.0)
+    assert await reader.async_get("ef" + "0" * 62) is None
+    assert (reader.hits, reader.misses) == (1, 1)
+
+
+def test_directory_read_only(tmp_path: Path) -> None:
+    """Test a read still succeeds when its modification time cannot be set."""
+    backend = DirectoryCacheBackend(None, str(tmp_path))
+    backend._write(KEY, AudioEntry("mp3", b"audio"))
+    with patch(
+        "custom_components.elevenlabs_custom_tts.cache.os.utime",
+        side_effect=PermissionError("read-only file system"),
+    ):
+        assert backend._read(KEY) == AudioEntry("mp3", b"audio")
+
+
+def _http_store(store: dict[str, bytes], status: int | None = None) -> httpx.AsyncClient:
+    """Return a client for a local key-value store, optionally always failing."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        key = request.url.path.rsplit("/", 1)[-1]
+        if status is not None:
+            return httpx.Response(status)
+        if request.method == "PUT":
+            store[key] = request.content
+            return httpx.Response(201)
+        if key in store:
+            return httpx.Response(200, content=store[key])
+        return httpx.Response(404)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def test_http_get_put(hass: HomeAssistant) -> None:
+    """Test audio is uploaded with PUT and fetched with GET."""
+    store: dict[str, bytes] = {}
+    with patch(
+        "custom_components.elevenlabs_custom_tts.cache.get_async_client",
+        return_value=_http_store(store),
+    ):
+        backend = HttpCacheBackend(hass, "http://cache.local/tts/")
+    assert await backend.async_get(KEY) is None
+
+    await backend.async_set(KEY, AudioEntry("mp3", b"audio", 0.5))
+    assert store == {KEY: encode_entry(AudioEntry("mp3", b"audio", 0.5))}
+    assert await backend.async_get(KEY) == AudioEntry("mp3", b"audio", 0.5)
+
+
+async def test_http_errors(hass: HomeAssistant) -> None:
+    """Test a failing store reads as a miss and reports failed uploads."""
+    with patch(
+        "custom_components.elevenlabs_custom_tts.cache.get_async_client",
+        return_value=_http_store({}, status=503),
+    ):
+        backend = HttpCacheBackend(hass, "http://cache.local/tts")
+    assert await backend.async_get(KEY) is None
+    with pytest.raises(httpx.HTTPStatusError):
+        await backend.async_set(KEY, AudioEntry("mp3", b"audio"))
+
+
+async def test_audio_cache_backs_off_after_write_error(hass: HomeAssistant) -> None:
+    """Test the shared store is skipped after an upload fails."""
+    store: dict[str, bytes] = {}
+    with patch(
+        "custom_components.elevenlabs_custom_tts.cache.get_async_client",
+        return_value=_http_store(store, status=500),
+    ):
+        cache = AudioCache(hass)
+        cache.configure(CACHE_BACKEND_HTTP, "http://cache.local/tts")
+    await cache.async_set(HASH, AudioEntry("mp3", b"audio"))
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert cache._available_shared() is None
+    # Memory still serves the audio
+    assert await cache.async_get(HASH) == AudioEntry("mp3", b"audio")
@@ -0,0 +1,71 @@
+"""Tests for canonical TTS options and audio cache keys."""
+
+from __future__ import annotations
+
+from custom_components.elevenlabs_custom_tts.canonical import (
+    audio_cache_key,
+    canonicalize_options,
+    quantize,
+    quantize_options,
+)
+
+DEFAULTS = {"stability": 0.5, "speed": 1.0, "model_id": "eleven_multilingual_v2"}
+OPTIONS = {"voice": "abc", "stability": 0.3, "speed": 1.1}
+
+
+def _key(message: str = "Hello there", **options) -> str:
+    return audio_cache_key(message, "en", {**OPTIONS, **options}, DEFAULTS)
+
+
+def test_quantize() -> None:
+    """Test floats are rounded to the option step and others kept."""
+    assert quantize(0.30000000004) == 0.3
+    assert quantize(0.304) == 0.3
+    assert quantize(1) == 1
+    assert quantize("on") == "on"
+
+
+def test_canonicalize_drops_defaults_and_unset() -> None:
+    """Test default, empty and unset values are dropped."""
+    assert canonicalize_options(
+        {"stability": 0.5, "speed": 1.2, "style": None, "voice": ""}, DEFAULTS
+    ) == {"speed": 1.2}
+
+
+def test_key_ignores_whitespace_and_order() -> None:
+    """Test whitespace in the message and option order do not change the key."""
+    assert _key("  Hello \n there ") == _key()
+    assert audio_cache_key(
+        "Hello there", "en", dict(reversed(list(OPTIONS.items()))), DEFAULTS
+    ) == _key()
+
+
+def test_key_treats_defaults_as_unset() -> None:
+    """Test an explicit default value gives the same key as leaving it out."""
+    assert _key(model_id="eleven_multilingual_v2") == _key()
+    assert _key(style=None) == _key()
+
+
+def test_key_quantizes_floats() -> None:
+    """Test float noise below the option step gives the same key."""
+    assert _key(stability=0.30000001) == _key()
+    assert _key(stability=0.4) != _key()
+
+
+def test_key_differs_by_content() -> None:
+    """Test message, language and voice are part of the key."""
+    assert _key("Goodbye") != _key()
+    assert audio_cache_key("Hello there", "de", OPTIONS, DEFAULTS) != _key()
+    assert _key(voice="xyz") != _key()
+
+
+def test_quantize_options() -> None:
+    """Test every float option is quantized and nothing is dropped."""
+    assert quantize_options({"stability": 0.333, "speed": 1.0, "voice": "abc"}) == {
+        "stability": 0.33, "speed": 1.0, "voice": "abc"
+    }
+
+
+def test_key_integer_default() -> None:
+    """Test an integer equal to a float default counts as the default."""
+    assert _key(speed=1) == _key(speed=1.0) == _key(speed=None)
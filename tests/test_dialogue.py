@@ -0,0 +1,39 @@
+"""Tests for dialogue markup parsing and joining segments."""
+
+from __future__ import annotations
+
+from custom_components.elevenlabs_custom_tts.audio import audio_duration, join_clips, pcm_to_wav
+from custom_components.elevenlabs_custom_tts.dialogue import DialogueSegment, parse_dialogue
+
+
+def test_no_markup() -> None:
+    """Test plain messages are not treated as dialogue."""
+    assert parse_dialogue("Good evening.") is None
+
+
+def test_segments() -> None:
+    """Test a message is split by voice tags."""
+    assert parse_dialogue(
+        "Welcome home. [voice:Butler] Good evening. [Voice: Security System ] Armed."
+    ) == [
+        DialogueSegment(None, "Welcome home."),
+        DialogueSegment("Butler", "Good evening."),
+        DialogueSegment("Security System", "Armed."),
+    ]
+
+
+def test_empty_segments_dropped() -> None:
+    """Test tags without text and empty tag names are handled."""
+    assert parse_dialogue("[voice:Butler] [voice:] Hello") == [
+        DialogueSegment(None, "Hello"),
+    ]
+
+
+def test_join_wav_clips() -> None:
+    """Test WAV segments in the same format are joined without ffmpeg."""
+    first = pcm_to_wav(b"\x01\x00" * 100, 24000)
+    second = pcm_to_wav(b"\x02\x00" * 50, 24000)
+    extension, data = join_clips([("wav", first), ("wav", second)], "ffmpeg-not-needed")
+    assert extension == "wav"
+    assert data == pcm_to_wav(b"\x01\x00" * 100 + b"\x02\x00" * 50, 24000)
+    assert audio_duration(extension, data) == 150 / 24000
@@ -0,0 +1,112 @@
+"""Tests for the circuit breaker in front of ElevenLabs."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from elevenlabs.core import ApiError
+
+from custom_components.elevenlabs_custom_tts.const import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_QUOTA_RESET_TIMEOUT,
+    CIRCUIT_RESET_TIMEOUT,
+)
+from custom_components.elevenlabs_custom_tts.fallback import (
+    CircuitBreaker,
+    EngineStats,
+    is_quota_error,
+)
+
+
+class Clock:
+    """Controllable replacement for time.monotonic."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _open(circuit: CircuitBreaker) -> None:
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+        assert circuit.allow_request()
+        circuit.record_failure()
+
+
+def test_opens_after_threshold() -> None:
+    """Test the circuit opens after consecutive failures only."""
+    circuit = CircuitBreaker()
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD - 1):
+        circuit.record_failure()
+    circuit.record_success()
+    assert circuit.is_closed
+
+    _open(circuit)
+    assert circuit.is_open
+    assert not circuit.is_closed
+    assert not circuit.allow_request()
+
+
+def test_single_trial_after_timeout() -> None:
+    """Test one trial request is let through once the reset timeout passes."""
+    clock = Clock()
+    with patch("custom_components.elevenlabs_custom_tts.fallback.time.monotonic", clock):
+        circuit = CircuitBreaker()
+        _open(circuit)
+        clock.now += CIRCUIT_RESET_TIMEOUT + 1
+        assert circuit.allow_request()
+        assert not circuit.allow_request()
+
+        # A failed trial re-opens the circuit
+        circuit.record_failure()
+        assert circuit.is_open
+        clock.now += CIRCUIT_RESET_TIMEOUT + 1
+
+        # A successful trial closes it
+        assert circuit.allow_request()
+        circuit.record_success()
+        assert circuit.is_closed
+        assert circuit.allow_request()
+        assert circuit.allow_request()
+
+
+def test_cancelled_trial_releases_slot() -> None:
+    """Test a cancelled trial lets the next request try again."""
+    clock = Clock()
+    with patch("custom_components.elevenlabs_custom_tts.fallback.time.monotonic", clock):
+        circuit = CircuitBreaker()
+        _open(circuit)
+        clock.now += CIRCUIT_RESET_TIMEOUT + 1
+        assert circuit.allow_request()
+        circuit.record_cancelled()
+        assert circuit.allow_request()
+
+
+def test_quota_opens_longer() -> None:
+    """Test an exhausted quota opens the circuit at once for longer."""
+    clock = Clock()
+    with patch("custom_components.elevenlabs_custom_tts.fallback.time.monotonic", clock):
+        circuit = CircuitBreaker()
+        circuit.record_failure(quota_exhausted=True)
+        assert circuit.is_open
+        clock.now += CIRCUIT_RESET_TIMEOUT + 1
+        assert not circuit.allow_request()
+        clock.now += CIRCUIT_QUOTA_RESET_TIMEOUT
+        assert circuit.allow_request()
+
+
+def test_is_quota_error() -> None:
+    """Test quota errors are told apart from other API errors."""
+    assert is_quota_error(ApiError(status_code=401, body={"detail": {"status": "quota_exceeded"}}))
+    assert not is_quota_error(ApiError(status_code=401, body={"detail": "invalid_api_key"}))
+    assert not is_quota_error(ApiError(status_code=500, body="quota_exceeded"))
+
+
+def test_engine_stats() -> None:
+    """Test the serving engine and fallback reason are recorded."""
+    stats = EngineStats()
+    stats.record("elevenlabs")
+    stats.record("tts.piper", "timeout")
+    assert stats.served == {"elevenlabs": 1, "tts.piper": 1}
+    assert (stats.last_engine, stats.last_fallback_reason) == ("tts.piper", "timeout")
@@ -0,0 +1,150 @@
+"""Tests for hedged ElevenLabs requests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.elevenlabs_custom_tts.const import (
+    DEFAULT_HEDGE_FALLBACK_DELAY,
+    HEDGE_MIN_SAMPLES,
+)
+from custom_components.elevenlabs_custom_tts.hedging import HedgeController
+from custom_components.elevenlabs_custom_tts.lifecycle import async_get_client_registry
+
+PARAMS = {"text": "Hello", "voice_id": "voice", "model_id": "eleven_multilingual_v2"}
+
+
+class FakeClient:
+    """Stand-in for AsyncElevenLabs with a configurable first-byte delay."""
+
+    def __init__(self, delay: float = 0, error: Exception | None = None) -> None:
+        self.text_to_speech = self
+        self.delay = delay
+        self.error = error
+        self.calls: list[dict] = []
+        self.closed = 0
+
+    def convert(self, **params) -> AsyncIterator[bytes]:
+        self.calls.append(params)
+        return self._stream()
+
+    async def _stream(self) -> AsyncIterator[bytes]:
+        try:
+            await asyncio.sleep(self.delay)
+            if self.error is not None:
+                raise self.error
+            yield b""
+            yield b"first"
+            yield b"rest"
+        finally:
+            self.closed += 1
+
+
+async def _rest(stream: AsyncIterator[bytes]) -> bytes:
+    return b"".join([chunk async for chunk in stream])
+
+
+async def test_unhedged(hass: HomeAssistant) -> None:
+    """Test a request without a delay is never hedged."""
+    controller = HedgeController(hass)
+    client = FakeClient()
+    first, stream, hedge_won = await controller.async_open(client, PARAMS)
+    assert (first, await _rest(stream), hedge_won) == (b"first", b"rest", False)
+    assert controller.stats.hedged_requests == 0
+
+
+async def test_fast_primary_not_hedged(hass: HomeAssistant) -> None:
+    """Test no hedge is fired when the primary answers within the delay."""
+    controller = HedgeController(hass)
+    client = FakeClient()
+    hedge = FakeClient()
+    first, _, hedge_won = await controller.async_open(
+        client, PARAMS, hedge_client=hedge, delay=0.5
+    )
+    assert (first, hedge_won) == (b"first", False)
+    assert not hedge.calls
+    assert controller.stats.fired == 0
+
+
+async def test_hedge_wins(hass: HomeAssistant) -> None:
+    """Test a faster hedge wins, uses its parameters and cancels the primary."""
+    controller = HedgeController(hass)
+    client = FakeClient(delay=5)
+    hedge = FakeClient()
+    first, stream, hedge_won = await controller.async_open(
+        client,
+        PARAMS,
+        hedge_client=hedge,
+        hedge_params={"model_id": "eleven_flash_v2_5"},
+        delay=0.01,
+    )
+    assert (first, await _rest(stream), hedge_won) == (b"first", b"rest", True)
+    assert hedge.calls == [{**PARAMS, "model_id": "eleven_flash_v2_5"}]
+    assert client.closed == 1
+    assert (controller.stats.fired, controller.stats.won) == (1, 1)
+    assert controller.stats.extra_characters == len(PARAMS["text"])
+
+
+async def test_primary_wins_after_hedge_fired(hass: HomeAssistant) -> None:
+    """Test the primary still wins when it answers before the hedge."""
+    controller = HedgeController(hass)
+    client = FakeClient(delay=0.05)
+    hedge = FakeClient(delay=5)
+    first, _, hedge_won = await controller.async_open(
+        client, PARAMS, hedge_client=hedge, delay=0.01
+    )
+    assert (first, hedge_won) == (b"first", False)
+    assert hedge.closed == 1
+    assert controller.stats.won == 0
+
+
+async def test_failed_hedge_ignored(hass: HomeAssistant) -> None:
+    """Test a failing hedge does not fail a primary that succeeds."""
+    controller = HedgeController(hass)
+    client = FakeClient(delay=0.05)
+    hedge = FakeClient(error=RuntimeError("hedge failed"))
+    first, _, hedge_won = await controller.async_open(
+        client, PARAMS, hedge_client=hedge, delay=0.01
+    )
+    assert (first, hedge_won) == (b"first", False)
+
+
+async def test_both_fail(hass: HomeAssistant) -> None:
+    """Test the error is raised when neither request produces audio."""
+    controller = HedgeController(hass)
+    client = FakeClient(delay=0.02, error=RuntimeError("primary failed"))
+    hedge = FakeClient(error=RuntimeError("hedge failed"))
+    with pytest.raises(RuntimeError):
+        await controller.async_open(client, PARAMS, hedge_client=hedge, delay=0.01)
+
+
+async def test_learned_delay(hass: HomeAssistant) -> None:
+    """Test the delay is fixed when configured and learned otherwise."""
+    controller = HedgeController(hass)
+    assert controller.hedge_delay(250, 90) == 0.25
+    assert controller.hedge_delay(0, 90) == DEFAULT_HEDGE_FALLBACK_DELAY
+
+    controller._ttfb.extend(index / 100 for index in range(1, HEDGE_MIN_SAMPLES + 1))
+    assert controller.hedge_delay(0, 50) == (HEDGE_MIN_SAMPLES // 2) / 100
+    assert controller.hedge_delay(0, 100) == HEDGE_MIN_SAMPLES / 100
+
+
+async def test_client_for_uses_registry(hass: HomeAssistant) -> None:
+    """Test alternative API key clients are shared and released."""
+    controller = HedgeController(hass)
+    default = FakeClient()
+    registry = async_get_client_registry(hass)
+    assert controller.client_for(None, default) is default
+
+    client = controller.client_for("other-key", default)
+    assert client is registry.acquire("other-key")
+    registry.release("other-key")
+    assert controller.client_for("other-key", default) is client
+
+    assert controller.client_for(None, default) is default
+    assert "other-key" not in registry._clients
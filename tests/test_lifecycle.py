@@ -0,0 +1,76 @@
+"""Tests for shared clients and in-flight request tracking."""
+
+from __future__ import annotations
+
+import asyncio
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.elevenlabs_custom_tts.lifecycle import (
+    RequestTracker,
+    async_get_client_registry,
+)
+
+
+async def test_drain_idle() -> None:
+    """Test draining without requests returns at once."""
+    assert await RequestTracker().async_drain(0)
+
+
+async def test_drain_waits_for_requests() -> None:
+    """Test draining waits until the last request finishes."""
+    tracker = RequestTracker()
+    release = asyncio.Event()
+
+    async def _request() -> None:
+        with tracker.track():
+            await release.wait()
+
+    tasks = [asyncio.create_task(_request()) for _ in range(2)]
+    await asyncio.sleep(0)
+    assert tracker.in_flight == 2
+
+    drain = asyncio.create_task(tracker.async_drain(1))
+    await asyncio.sleep(0)
+    assert not drain.done()
+    release.set()
+    assert await drain
+    await asyncio.gather(*tasks)
+    assert tracker.in_flight == 0
+
+
+async def test_drain_timeout() -> None:
+    """Test draining gives up after the timeout."""
+    tracker = RequestTracker()
+    with tracker.track():
+        assert not await tracker.async_drain(0.01)
+        assert tracker.in_flight == 1
+
+
+async def test_drain_after_error() -> None:
+    """Test a failed request is no longer counted."""
+    tracker = RequestTracker()
+    try:
+        with tracker.track():
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert tracker.in_flight == 0
+    assert await tracker.async_drain(0)
+
+
+async def test_client_registry(hass: HomeAssistant) -> None:
+    """Test clients are shared per API key until the last release."""
+    registry = async_get_client_registry(hass)
+    assert async_get_client_registry(hass) is registry
+
+    client = registry.acquire("key")
+    assert registry.acquire("key") is client
+    assert registry.acquire("other") is not client
+
+    registry.release("key")
+    assert registry.acquire("key") is client
+    registry.release("key")
+    registry.release("key")
+    assert registry.acquire("key") is not client
+    registry.release("unknown")
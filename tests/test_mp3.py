@@ -0,0 +1,118 @@
+"""Tests for MP3 frame scanning and joining."""
+
+from __future__ import annotations
+
+from custom_components.elevenlabs_custom_tts.mp3 import (
+    Mp3Scanner,
+    join_mp3,
+    parse_header,
+    scan_mp3,
+)
+
+# MPEG 1 Layer III, 128 kbit/s, mono, without padding or CRC
+HEADER_44K = bytes([0xFF, 0xFB, 0x90, 0xC0])
+HEADER_48K = bytes([0xFF, 0xFB, 0x94, 0xC0])
+FRAME_44K = HEADER_44K + bytes(413)
+FRAME_48K = HEADER_48K + bytes(380)
+
+
+def _info_frame(delay: int, padding: int) -> bytes:
+    """Return a Xing "Info" header frame with a LAME tag."""
+    tag = b"Info" + bytes(4)  # No optional fields
+    lame = b"LAME3.100" + bytes(12) + ((delay << 12) | padding).to_bytes(3, "big")
+    body = bytes(17) + tag + lame
+    return HEADER_44K + body + bytes(413 - len(body))
+
+
+def _id3v2(size: int) -> bytes:
+    """Return an ID3v2 tag with size bytes of payload."""
+    syncsafe = bytes((size >> shift) & 0x7F for shift in (21, 14, 7, 0))
+    return b"ID3\x04\x00\x00" + syncsafe + bytes(size)
+
+
+def test_parse_header() -> None:
+    """Test frame lengths and formats are read from the header."""
+    header = parse_header(FRAME_44K, 0)
+    assert header is not None
+    assert (header.sample_rate, header.channels, header.length) == (44100, 1, 417)
+    assert parse_header(FRAME_48K, 0).length == 384
+    assert parse_header(b"\xff\xfb", 0) is None
+    assert parse_header(b"\x00" * 4, 0) is None
+
+
+def test_scan_counts_frames() -> None:
+    """Test a clean clip is counted without damage."""
+    scanner = scan_mp3(FRAME_44K * 10)
+    assert scanner.info.frames == 10
+    assert not scanner.info.damaged
+    assert scanner.info.duration == 10 * 1152 / 44100
+    assert scanner.frames[1] == (417, 834)
+
+
+def test_scan_chunked() -> None:
+    """Test feeding a stream in small chunks gives the same result."""
+    data = _id3v2(300) + FRAME_44K * 5
+    scanner = Mp3Scanner()
+    for start in range(0, len(data), 37):
+        scanner.feed(data[start:start + 37])
+    info = scanner.finish()
+    assert info.frames == 5
+    assert not info.damaged
+    assert scanner.audio(data) == FRAME_44K * 5
+
+
+def test_scan_resyncs_after_garbage() -> None:
+    """Test corrupt bytes between frames are skipped and counted."""
+    data = FRAME_44K * 2 + b"\x00\x01\xff\x02" + FRAME_44K * 2
+    scanner = scan_mp3(data)
+    assert scanner.info.frames == 4
+    assert scanner.info.corrupt_bytes == 4
+    assert scanner.audio(data) == FRAME_44K * 4
+
+
+def test_scan_rejects_false_sync() -> None:
+    """Test a header-like pattern in garbage is not taken for a frame."""
+    data = FRAME_44K + b"\x00" + HEADER_44K + b"\x00" * 20 + FRAME_44K * 2
+    scanner = scan_mp3(data)
+    assert scanner.info.frames == 3
+    assert scanner.audio(data) == FRAME_44K * 3
+
+
+def test_scan_truncated() -> None:
+    """Test a partial last frame is reported and dropped."""
+    data = FRAME_44K * 3 + FRAME_44K[:100]
+    scanner = scan_mp3(data)
+    assert scanner.info.frames == 3
+    assert scanner.info.truncated
+    assert scanner.audio(data) == FRAME_44K * 3
+
+
+def test_scan_skips_tags() -> None:
+    """Test ID3v2 and ID3v1 tags are not counted as audio or damage."""
+    data = _id3v2(1000) + FRAME_44K * 4 + b"TAG" + bytes(125)
+    scanner = scan_mp3(data)
+    assert scanner.info.frames == 4
+    assert not scanner.info.damaged
+    assert scanner.audio(data) == FRAME_44K * 4
+
+
+def test_scan_reads_gapless_info() -> None:
+    """Test the Info frame is skipped and its encoder delay and padding read."""
+    data = _info_frame(576, 1000) + FRAME_44K * 10
+    scanner = scan_mp3(data)
+    info = scanner.info
+    assert info.frames == 10
+    assert (info.encoder_delay, info.encoder_padding) == (576, 1000)
+    assert info.samples == 10 * 1152 - 576 - 1000
+    assert scanner.audio(data) == FRAME_44K * 10
+
+
+def test_join_drops_padding_frames() -> None:
+    """Test whole frames of padding are dropped between clips but not at the end."""
+    clip = _info_frame(576, 1200) + FRAME_44K * 5
+    assert join_mp3([clip, clip]) == FRAME_44K * 9
+
+
+def test_join_mismatched_formats() -> None:
+    """Test clips with different sample rates cannot be joined frame by frame."""
+    assert join_mp3([FRAME_44K * 2, FRAME_48K * 2]) is None
@@ -0,0 +1,69 @@
+"""Tests for the message history driving pre-synthesis."""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import HomeAssistant
+
+from custom_components.elevenlabs_custom_tts.const import PRESYNTH_STORAGE_KEY
+from custom_components.elevenlabs_custom_tts.presynthesis import MessageHistory
+
+BUTLER = {"voice_profile": "Butler"}
+
+
+def _record(history: MessageHistory, message: str, times: int, options=BUTLER) -> None:
+    for _ in range(times):
+        history.record(message, "en", options)
+
+
+async def test_top(hass: HomeAssistant) -> None:
+    """Test the most frequent requests over all profiles come first."""
+    history = MessageHistory(hass, "entry")
+    _record(history, "Dinner is ready", 3)
+    _record(history, "Door open", 5, {"voice_profile": "Security"})
+    _record(history, "Good night", 1)
+    assert history.top(2) == [
+        ("Door open", "en", {"voice_profile": "Security"}),
+        ("Dinner is ready", "en", BUTLER),
+    ]
+
+
+async def test_eviction(hass: HomeAssistant) -> None:
+    """Test a full profile forgets its least frequent request."""
+    history = MessageHistory(hass, "entry")
+    with patch("custom_components.elevenlabs_custom_tts.presynthesis.PRESYNTH_HISTORY_SIZE", 2):
+        _record(history, "Often", 3)
+        _record(history, "Rarely", 1)
+        _record(history, "New", 1)
+        # Other profiles have room of their own
+        _record(history, "Other", 1, {"voice_profile": "Security"})
+    assert [message for message, _, _ in history.top(10)] == ["Often", "Other", "New"]
+
+
+async def test_decay(hass: HomeAssistant) -> None:
+    """Test counts are halved when one reaches the maximum."""
+    history = MessageHistory(hass, "entry")
+    with patch("custom_components.elevenlabs_custom_tts.presynthesis.PRESYNTH_MAX_COUNT", 4):
+        _record(history, "Favourite", 3)
+        _record(history, "Twice", 2)
+        _record(history, "Once", 1)
+        _record(history, "Favourite", 1)
+    # 4 -> 2, 2 -> 1 and 1 is dropped
+    assert sorted(history._profiles["Butler"].values()) == [1, 2]
+    assert [message for message, _, _ in history.top(10)] == ["Favourite", "Twice"]
+
+
+async def test_persisted(hass: HomeAssistant, hass_storage: dict[str, Any]) -> None:
+    """Test the pending history is saved on shutdown and loaded again."""
+    history = MessageHistory(hass, "entry")
+    _record(history, "Dinner is ready", 2)
+    assert f"{PRESYNTH_STORAGE_KEY}.entry" not in hass_storage
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+    await hass.async_block_till_done()
+
+    loaded = MessageHistory(hass, "entry")
+    await loaded.async_load()
+    assert loaded.top(1) == [("Dinner is ready", "en", BUTLER)]
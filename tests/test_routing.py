@@ -0,0 +1,90 @@
+"""Tests for language detection and model routing."""
+
+from __future__ import annotations
+
+from custom_components.elevenlabs_custom_tts.const import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    ROUTING_STREAMING_LATENCY,
+)
+from custom_components.elevenlabs_custom_tts.language import detect_language
+from custom_components.elevenlabs_custom_tts.routing import choose_route
+
+LONG_TEXT = "The washing machine has finished and the laundry is ready. " * 4
+
+
+def test_detect_script() -> None:
+    """Test non-Latin scripts are recognized by their characters."""
+    assert detect_language("こんにちは") == "ja"
+    assert detect_language("안녕하세요") == "ko"
+    assert detect_language("Привет") == "ru"
+    assert detect_language("Привіт, як справи") == "uk"
+
+
+def test_detect_stopwords() -> None:
+    """Test Latin-script languages are recognized by stopwords."""
+    assert detect_language("The door is open and the light is on") == "en"
+    assert detect_language("Die Tür ist nicht abgeschlossen, bitte prüfen") == "de"
+
+
+def test_detect_unsure() -> None:
+    """Test no language is guessed without evidence."""
+    assert detect_language("12:30") is None
+    assert detect_language("Kitchen") is None
+
+
+def test_route_interactive() -> None:
+    """Test interactive requests use the fastest model for the language."""
+    route = choose_route(LONG_TEXT, "en-US", "eleven_multilingual_v2", PRIORITY_INTERACTIVE)
+    assert route.model_id == "eleven_flash_v2"
+    assert route.language == "en"
+    assert route.reason == "interactive"
+    assert route.optimize_streaming_latency == ROUTING_STREAMING_LATENCY
+
+
+def test_route_short_keeps_fast_profile_model() -> None:
+    """Test a profile model that is already fastest is kept."""
+    route = choose_route("Hello there", "en", "eleven_flash_v2", None)
+    assert route.model_id == "eleven_flash_v2"
+    assert route.reason == "short"
+
+
+def test_route_background_and_long() -> None:
+    """Test background and long messages keep the profile's model."""
+    assert choose_route(
+        "Hi", "en", "eleven_multilingual_v2", PRIORITY_BACKGROUND
+    ).model_id == "eleven_multilingual_v2"
+    route = choose_route(LONG_TEXT, "en", "eleven_multilingual_v2", None)
+    assert (route.model_id, route.reason) == ("eleven_multilingual_v2", "profile")
+
+
+def test_route_unsupported_language() -> None:
+    """Test a model without the detected language is replaced."""
+    route = choose_route(
+        "Die Waschmaschine ist fertig und die Wäsche ist bereit. " * 4,
+        "en",
+        "eleven_monolingual_v1",
+        PRIORITY_BACKGROUND,
+    )
+    assert (route.model_id, route.language, route.reason) == (
+        "eleven_flash_v2_5", "de", "language"
+    )
+
+
+def test_detect_tie() -> None:
+    """Test an equal stopword score for two languages is not a guess."""
+    assert detect_language("det er") is None
+
+
+def test_route_uses_request_language() -> None:
+    """Test the request's region is dropped when nothing is detected."""
+    route = choose_route("OK", "de-DE", "eleven_multilingual_v2", PRIORITY_INTERACTIVE)
+    assert (route.model_id, route.language) == ("eleven_flash_v2_5", "de")
+
+
+def test_route_unknown_language_keeps_model() -> None:
+    """Test the profile model is kept when no model supports the language."""
+    route = choose_route("12:30 " * 30, "xx", "eleven_multilingual_v2", None)
+    assert (route.model_id, route.language, route.reason) == (
+        "eleven_multilingual_v2", "xx", "language"
+    )
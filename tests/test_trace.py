@@ -0,0 +1,59 @@
+"""Tests for per-request tracing."""
+
+from __future__ import annotations
+
+import json
+import logging
+
+import pytest
+
+from custom_components.elevenlabs_custom_tts.trace import NULL_TRACE, RequestTrace, Tracer
+
+
+def test_trace_fields_and_phases() -> None:
+    """Test known fields, details and phases end up in the trace."""
+    trace = RequestTrace(12)
+    trace.set(profile="Butler", model="eleven_flash_v2_5", hedge_won=True)
+    trace.mark("resolve")
+    trace.mark("first_byte")
+
+    data = trace.as_dict()
+    assert (data["profile"], data["model"], data["characters"]) == (
+        "Butler", "eleven_flash_v2_5", 12
+    )
+    assert data["hedge_won"] is True
+    assert list(data["phases_ms"]) == ["resolve", "first_byte"]
+    assert data["total_ms"] == pytest.approx(sum(data["phases_ms"].values()), abs=0.05)
+
+
+def test_disabled_tracing() -> None:
+    """Test disabled tracing hands out the no-op trace and stores nothing."""
+    tracer = Tracer()
+    trace = tracer.start(False, 10)
+    assert trace is NULL_TRACE
+    trace.set(profile="Butler")
+    trace.mark("resolve")
+    tracer.finish(trace, log=True)
+    assert tracer.as_list() == []
+
+
+def test_ring_buffer() -> None:
+    """Test only the most recent traces are kept, oldest first."""
+    tracer = Tracer(size=2)
+    for characters in (1, 2, 3):
+        tracer.finish(tracer.start(True, characters))
+    traces = tracer.as_list()
+    assert [trace["characters"] for trace in traces] == [2, 3]
+    assert "finish" in traces[0]["phases_ms"]
+    assert traces[0]["request_id"] != traces[1]["request_id"]
+
+
+def test_log_line(caplog: pytest.LogCaptureFixture) -> None:
+    """Test a finished trace can be logged as one JSON line."""
+    tracer = Tracer()
+    trace = tracer.start(True, 5)
+    trace.set(outcome="ok")
+    with caplog.at_level(logging.INFO):
+        tracer.finish(trace, log=True)
+    line = caplog.records[-1].getMessage().removeprefix("TTS trace: ")
+    assert json.loads(line)["outcome"] == "ok"
@@ -0,0 +1,60 @@
+"""Tests for parsing the raw voice list."""
+
+from __future__ import annotations
+
+import json
+
+from custom_components.elevenlabs_custom_tts.voices import parse_voices
+
+RESPONSE = json.dumps({
+    "voices": [
+        {
+            "voice_id": "1",
+            "name": "Rachel",
+            "category": "premade",
+            "description": "Calm narration",
+            "labels": {"accent": "american", "gender": "female"},
+            "samples": [{"sample_id": "x"}],
+        },
+        {"voice_id": "2", "name": "Butler", "category": "cloned", "labels": {}},
+        {"voice_id": "3", "name": None, "category": None, "description": None},
+    ]
+}).encode()
+
+
+def test_all_voices() -> None:
+    """Test every voice is returned with only the fields that are set."""
+    assert parse_voices(RESPONSE, None, "") == [
+        {
+            "voice_id": "1",
+            "name": "Rachel",
+            "category": "premade",
+            "description": "Calm narration",
+            "labels": {"accent": "american", "gender": "female"},
+        },
+        {"voice_id": "2", "name": "Butler", "category": "cloned"},
+        {"voice_id": "3", "name": "", "category": ""},
+    ]
+
+
+def test_filter_by_type() -> None:
+    """Test voices can be filtered by category."""
+    assert [voice["voice_id"] for voice in parse_voices(RESPONSE, "cloned", "")] == ["2"]
+
+
+def test_search() -> None:
+    """Test the search covers name, category, description and labels."""
+    for text, expected in (
+        ("butler", ["2"]),
+        ("calm", ["1"]),
+        ("american", ["1"]),
+        ("gender female", ["1"]),
+        ("premade", ["1"]),
+        ("nobody", []),
+    ):
+        assert [voice["voice_id"] for voice in parse_voices(RESPONSE, None, text)] == expected
+
+
+def test_empty_response() -> None:
+    """Test a response without voices gives an empty list."""
+    assert parse_voices(b"{}", None, "") == []